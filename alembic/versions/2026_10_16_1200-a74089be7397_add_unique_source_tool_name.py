@@ -0,0 +1,40 @@
+"""add_unique_source_tool_name
+
+Revision ID: a74089be7397
+Revises: 6abd4ede50e1
+Create Date: 2026-10-16 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a74089be7397'
+down_revision = '6abd4ede50e1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Drop duplicate cached tools (keep the most recently refreshed row per source/tool name)
+    op.execute(
+        """
+        DELETE FROM source_tools st
+        USING source_tools newer
+        WHERE st.source_id = newer.source_id
+          AND st.tool_name = newer.tool_name
+          AND (st.last_refreshed_at, st.tool_id) < (newer.last_refreshed_at, newer.tool_id)
+        """
+    )
+    
+    # Tool caching upserts on (source_id, tool_name)
+    op.create_unique_constraint(
+        'uq_source_tools_source_id_tool_name',
+        'source_tools',
+        ['source_id', 'tool_name']
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint('uq_source_tools_source_id_tool_name', 'source_tools', type_='unique')
@@ -0,0 +1,38 @@
+"""add_sources_active_cached_index
+
+Revision ID: 3c1f9e27b5d4
+Revises: a74089be7397
+Create Date: 2026-10-16 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3c1f9e27b5d4'
+down_revision = 'a74089be7397'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Partial index for tool loading (a user's active, cached sources); built
+    # concurrently so the sources table stays writable during the migration
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_sources_owner_user_id_active_cached',
+            'sources',
+            ['owner_user_id'],
+            postgresql_where=sa.text("is_active AND tools_cache_status = 'cached'"),
+            postgresql_concurrently=True
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_sources_owner_user_id_active_cached',
+            table_name='sources',
+            postgresql_concurrently=True
+        )
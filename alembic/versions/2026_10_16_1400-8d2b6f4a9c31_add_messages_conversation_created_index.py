@@ -0,0 +1,37 @@
+"""add_messages_conversation_created_index
+
+Revision ID: 8d2b6f4a9c31
+Revises: 3c1f9e27b5d4
+Create Date: 2026-10-16 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8d2b6f4a9c31'
+down_revision = '3c1f9e27b5d4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Conversation history loads (latest messages of a conversation by creation time);
+    # built concurrently so the messages table stays writable during the migration
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_messages_conversation_id_created_at',
+            'messages',
+            ['conversation_id', 'created_at'],
+            postgresql_concurrently=True
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_messages_conversation_id_created_at',
+            table_name='messages',
+            postgresql_concurrently=True
+        )
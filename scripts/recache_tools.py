@@ -97,10 +97,16 @@ async def main():
     # Re-cache each source
     print("\n🚀 Starting re-cache process...")
     
+    results = await FastMCPService.discover_and_cache_tools_many(list(problematic_sources))
+    
     success_count = 0
-    for source_id, info in problematic_sources.items():
-        if await recache_source(source_id, info['name']):
+    for source_id, success, message, tool_count in results:
+        print(f"\n📦 {problematic_sources[source_id]['name']}")
+        if success:
+            print(f"✅ Success: {message}")
             success_count += 1
+        else:
+            print(f"❌ Failed: {message}")
     
     print("\n" + "=" * 60)
     print(f"✅ COMPLETED: {success_count}/{len(problematic_sources)} sources re-cached successfully")
@@ -420,14 +420,16 @@ class SimpleSourceExtractor:
         if source_type == "google_drive":
             file_id = tool_params.get("file_id") or tool_params.get("id")
             if file_id:
-                # Infer document type from content or tool name
-                if "spreadsheet" in content.lower() or "sheet" in tool_lower:
+                # Infer document type from content or tool name (content lowercased once,
+                # not once per check: it can be a full tool result)
+                content_lower = content.lower()
+                if "spreadsheet" in content_lower or "sheet" in tool_lower:
                     return f"https://docs.google.com/spreadsheets/d/{file_id}/edit"
-                elif "document" in content.lower() or "doc" in tool_lower:
+                elif "document" in content_lower or "doc" in tool_lower:
                     return f"https://docs.google.com/document/d/{file_id}/edit"
-                elif "presentation" in content.lower() or "slide" in tool_lower:
+                elif "presentation" in content_lower or "slide" in tool_lower:
                     return f"https://docs.google.com/presentation/d/{file_id}/edit"
-                elif "folder" in content.lower():
+                elif "folder" in content_lower:
                     return f"https://drive.google.com/drive/folders/{file_id}"
                 else:
                     return f"https://drive.google.com/file/d/{file_id}/view"
@@ -5,13 +5,35 @@ Handles token counting, conversation history truncation, and context window mana
 to prevent LLM context overflow.
 """
 
-import re
+from collections import OrderedDict
 from typing import List, Dict, Any, Tuple, Optional
 from dataclasses import dataclass
 import structlog
 
 logger = structlog.get_logger()
 
+# Token estimates keyed by the text itself: the same history messages and tool results are
+# estimated several times per query and again on later turns. str hashes are cached on the
+# string object, and a hit on the same object compares by identity, so lookups stay cheap.
+TOKEN_ESTIMATE_CACHE_MAXSIZE = 4096
+_token_estimate_cache: "OrderedDict[str, int]" = OrderedDict()
+
+# (model name substring, context window, safe limit), checked in order: the first match
+# wins, so more specific names (gpt-4o, gpt-4-turbo) must precede their prefixes (gpt-4)
+_MODEL_LIMITS_TABLE = (
+    # Claude models
+    ("claude-3-5-sonnet", 200000, 180000),
+    ("claude-sonnet-4", 200000, 180000),
+    ("claude-3-haiku", 200000, 180000),
+    ("claude-3-opus", 200000, 180000),
+    # OpenAI models
+    ("gpt-4o", 128000, 120000),
+    ("gpt-4-turbo", 128000, 120000),
+    ("gpt-4", 8192, 7000),
+    ("gpt-3.5-turbo", 16385, 15000),
+)
+
+
 @dataclass
 class ModelLimits:
     """Token limits for different LLM models"""
@@ -21,29 +43,13 @@ class ModelLimits:
     @classmethod
     def get_limits(cls, model_name: str) -> 'ModelLimits':
         """Get token limits for specific model"""
-        
-        # Claude models
-        if "claude-3-5-sonnet" in model_name or "claude-sonnet-4" in model_name:
-            return cls(context_window=200000, safe_limit=180000)
-        elif "claude-3-haiku" in model_name:
-            return cls(context_window=200000, safe_limit=180000)
-        elif "claude-3-opus" in model_name:
-            return cls(context_window=200000, safe_limit=180000)
-        
-        # OpenAI models
-        elif "gpt-4o" in model_name:
-            return cls(context_window=128000, safe_limit=120000)
-        elif "gpt-4-turbo" in model_name:
-            return cls(context_window=128000, safe_limit=120000)
-        elif "gpt-4" in model_name:
-            return cls(context_window=8192, safe_limit=7000)
-        elif "gpt-3.5-turbo" in model_name:
-            return cls(context_window=16385, safe_limit=15000)
+        for pattern, context_window, safe_limit in _MODEL_LIMITS_TABLE:
+            if pattern in model_name:
+                return cls(context_window=context_window, safe_limit=safe_limit)
         
         # Default conservative limits
-        else:
-            logger.warning(f"Unknown model {model_name}, using conservative limits")
-            return cls(context_window=8192, safe_limit=7000)
+        logger.warning(f"Unknown model {model_name}, using conservative limits")
+        return cls(context_window=8192, safe_limit=7000)
 
 
 class TokenEstimator:
@@ -63,14 +69,23 @@ class TokenEstimator:
             # Convert to string representation
             text = str(text)
         
-        # Remove extra whitespace
-        cleaned = re.sub(r'\s+', ' ', text.strip())
+        token_estimate = _token_estimate_cache.get(text)
+        if token_estimate is not None:
+            _token_estimate_cache.move_to_end(text)
+            return token_estimate
+        
+        # Length with extra whitespace collapsed; split()/join() run in C and match
+        # re.sub(r'\s+', ' ', text.strip()) exactly, at a fraction of the cost
+        char_count = len(' '.join(text.split()))
         
         # Rough estimation: 1 token per 4 characters
         # Add some buffer for special tokens, formatting, etc.
-        char_count = len(cleaned)
         token_estimate = max(1, int(char_count / 3.5))  # Slightly conservative
         
+        _token_estimate_cache[text] = token_estimate
+        if len(_token_estimate_cache) > TOKEN_ESTIMATE_CACHE_MAXSIZE:
+            _token_estimate_cache.popitem(last=False)
+        
         return token_estimate
     
     @staticmethod
@@ -104,10 +119,7 @@ class ContextManager:
         total_tokens += TokenEstimator.estimate_tokens(system_prompt)
         
         # Conversation history
-        for msg in conversation_history:
-            if hasattr(msg, 'content'):
-                role = "user" if "Human" in str(type(msg)) else "assistant"
-                total_tokens += TokenEstimator.estimate_message_tokens(role, msg.content)
+        total_tokens += self.estimate_history_tokens(conversation_history)
         
         # Current message
         total_tokens += TokenEstimator.estimate_message_tokens("user", current_message)
@@ -123,6 +135,17 @@ class ContextManager:
         
         return total_tokens
     
+    def estimate_history_tokens(self, messages: List[Any]) -> int:
+        """Estimate tokens for conversation messages, including role overhead"""
+        
+        total_tokens = 0
+        for msg in messages:
+            if hasattr(msg, 'content'):
+                role = "user" if "Human" in str(type(msg)) else "assistant"
+                total_tokens += TokenEstimator.estimate_message_tokens(role, msg.content)
+        
+        return total_tokens
+    
     def truncate_conversation_history(
         self,
         conversation_history: List[Any],
@@ -257,11 +280,12 @@ class ContextManager:
         if len(tool_result) <= start_length + end_length + 200:
             return tool_result
         
-        truncated = (
-            tool_result[:start_length] + 
-            f"\n\n[... TRUNCATED: {len(tool_result) - start_length - end_length} characters removed for context size management ...]\n\n" +
+        # One join: no intermediate start+marker string copied again for the tail
+        truncated = "".join((
+            tool_result[:start_length],
+            f"\n\n[... TRUNCATED: {len(tool_result) - start_length - end_length} characters removed for context size management ...]\n\n",
             tool_result[-end_length:]
-        )
+        ))
         
         logger.info(
             f"Truncated tool result: {len(tool_result)} → {len(truncated)} chars "
@@ -333,9 +357,12 @@ class ContextManager:
         # Optimize citation context (keep most important parts)
         optimized_citation_context = citation_context
         if citation_context and len(citation_context) > 2000:
-            lines = citation_context.split('\n')
-            if len(lines) > 20:  # Keep first few and last few lines
-                optimized_citation_context = '\n'.join(lines[:10] + ['[... truncated ...]'] + lines[-5:])
+            # Only the first 10 and last 5 lines are kept, so split off just those
+            # instead of materializing every line
+            if citation_context.count('\n') >= 20:  # More than 20 lines
+                head = citation_context.split('\n', 10)[:10]
+                tail = citation_context.rsplit('\n', 5)[-5:]
+                optimized_citation_context = '\n'.join(head + ['[... truncated ...]'] + tail)
         
         # Calculate tokens used by non-history content
         non_history_tokens = (
@@ -10,10 +10,14 @@ Performance improvements:
 """
 
 import asyncio
+import logging
+import os
+import re
 import uuid
 import time
-from typing import List, Dict, Any, Optional, AsyncGenerator, Tuple
+from typing import List, Dict, Any, Optional, AsyncGenerator, Tuple, Sequence
 from datetime import datetime, timezone
+from functools import lru_cache
 
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
@@ -23,11 +27,16 @@ from langchain_anthropic import ChatAnthropic
 from langchain_openai import ChatOpenAI
 import structlog
 
+from src.config import settings
 from src.db.models import Message
 from src.agents.fast_mcp import FastMCPToolManager
-from src.agents.context_manager import ContextManager
+from src.agents.context_manager import ContextManager, TokenEstimator
+from src.agents.tool_result_processor import ToolResultProcessor
 
 logger = structlog.get_logger()
+# Underlying stdlib logger (the one structlog's filter_by_level consults), for skipping
+# debug-only work entirely when debug logging is off
+_stdlib_logger = logging.getLogger(__name__)
 
 # Scintilla Local Agent Protocol - User must use these URL schemes for local tools
 SCINTILLA_LOCAL_SCHEMES = [
@@ -43,6 +52,45 @@ TOOL_PREVIEW_LENGTH = 500
 DEFAULT_TEMPERATURE = 0.1
 
 
+def _keyword_pattern(*keywords: str) -> "re.Pattern[str]":
+    """Compile keywords into one substring-matching alternation"""
+    return re.compile("|".join(map(re.escape, keywords)))
+
+
+# Tool name keywords per source type, checked in order (first match wins)
+_SOURCE_TYPE_PATTERNS = (
+    ("tickets", _keyword_pattern('jira', 'github', 'ticket', 'issue', 'bug')),
+    ("communications", _keyword_pattern('gmail', 'email', 'slack', 'teams', 'chat')),
+    ("documentation", _keyword_pattern('confluence', 'wiki', 'documentation', 'docs')),
+    ("code", _keyword_pattern('github', 'gitlab', 'git', 'repository', 'code')),
+    ("files", _keyword_pattern('file', 'document', 'storage')),
+)
+
+# Query keywords used to suggest which source types to search
+_STATUS_QUERY_RE = _keyword_pattern('status', 'integration', 'progress', 'update', 'current')
+_ISSUE_QUERY_RE = _keyword_pattern('error', 'bug', 'issue', 'problem', 'failure', 'not working')
+_HOWTO_QUERY_RE = _keyword_pattern('how', 'implement', 'setup', 'configure', 'install')
+_PROJECT_QUERY_RE = _keyword_pattern('project', 'plan', 'roadmap', 'timeline', 'milestone')
+
+# Parameter description keywords marking examples or syntax worth surfacing in the prompt
+_PARAM_GUIDANCE_RE = _keyword_pattern('example', 'syntax', 'format', 'language', 'query')
+
+
+@lru_cache(maxsize=4096)
+def _classify_tool_source_type(tool_name: str) -> Optional[str]:
+    """
+    Map a tool name to its source type (tickets, communications, ...) or None
+    
+    Tool names are immutable, so the lowercasing and scan are memoized per name
+    instead of being redone for every tool on every query.
+    """
+    tool_name_lower = tool_name.lower()
+    for source_type, pattern in _SOURCE_TYPE_PATTERNS:
+        if pattern.search(tool_name_lower):
+            return source_type
+    return None
+
+
 class FastMCPAgent:
     """
     Simplified Fast MCP Agent using centralized FastMCP service
@@ -57,8 +105,8 @@ class FastMCPAgent:
     def __init__(self):
         """Initialize FastMCPAgent"""
         self.tool_manager = FastMCPToolManager()
-        self.tools: List[BaseTool] = []
-        self.loaded_sources: List[str] = []
+        self.tools: Sequence[BaseTool] = ()
+        self.loaded_sources: Sequence[str] = ()
         self.source_instructions: Dict[str, str] = {}  # Map source name to instructions
         self.context_manager = None  # Will be initialized in query() based on model
         
@@ -82,41 +130,11 @@ class FastMCPAgent:
         tool_count = await self.tool_manager.load_tools_for_user(
             db=db,
             user_id=user_id,
-            bot_source_ids=bot_source_ids
+            bot_source_ids=bot_source_ids,
+            selected_bot_ids=selected_bot_ids
         )
         
-        # Store references for compatibility
-        self.tools = self.tool_manager.get_tools()
-        self.loaded_sources = self.tool_manager.get_server_names()
-        
-        # Get source instructions from the tool manager (FIXED: Pass selected bot IDs)
-        self.source_instructions = await self.tool_manager.get_source_instructions(db, selected_bot_ids)
-        
-        # Debug log source instructions for preprocessing
-        if self.source_instructions:
-            logger.info("📋 Source instructions loaded for preprocessing", 
-                       instruction_count=len(self.source_instructions))
-            for source_name, instructions in self.source_instructions.items():
-                if instructions:
-                    has_project = 'project' in instructions.lower()
-                    has_space = 'space' in instructions.lower()
-                    logger.debug("📄 Source instruction details", 
-                               source=source_name, 
-                               has_project_filter=has_project,
-                               has_space_filter=has_space,
-                               instruction_length=len(instructions))
-        else:
-            logger.info("❌ No source instructions found")
-        
-        # Classify tools for routing
-        self._classify_tools()
-        
-        logger.info("FastMCP tools loaded and classified", 
-                   tool_count=tool_count, 
-                   sources=len(self.loaded_sources),
-                   local_tools=len(self.local_tools),
-                   remote_tools=len(self.remote_tools))
-        return tool_count
+        return await self._finish_tool_load(db, tool_count, selected_bot_ids, "FastMCP tools loaded and classified")
     
     async def load_tools_for_specific_sources(
         self, 
@@ -132,9 +150,22 @@ class FastMCPAgent:
         tool_count = await self.tool_manager.load_tools_for_specific_sources(
             db=db,
             user_id=user_id,
-            source_ids=source_ids
+            source_ids=source_ids,
+            selected_bot_ids=selected_bot_ids
         )
         
+        return await self._finish_tool_load(
+            db, tool_count, selected_bot_ids, "FastMCP tools loaded and classified for specific sources"
+        )
+    
+    async def _finish_tool_load(
+        self,
+        db: AsyncSession,
+        tool_count: int,
+        selected_bot_ids: Optional[List[uuid.UUID]],
+        loaded_event: str
+    ) -> int:
+        """Publish the tool manager's freshly loaded tools and instructions (shared by both load paths)"""
         # Store references for compatibility
         self.tools = self.tool_manager.get_tools()
         self.loaded_sources = self.tool_manager.get_server_names()
@@ -142,28 +173,25 @@ class FastMCPAgent:
         # Get source instructions from the tool manager (FIXED: Pass selected bot IDs)
         self.source_instructions = await self.tool_manager.get_source_instructions(db, selected_bot_ids)
         
-        # Debug log source instructions for preprocessing
-        if self.source_instructions:
-            logger.info("📋 Source instructions loaded for preprocessing", 
-                       instruction_count=len(self.source_instructions))
+        # Debug log source instructions for preprocessing (only analyzed when debug is on)
+        if self.source_instructions and _stdlib_logger.isEnabledFor(logging.DEBUG):
             for source_name, instructions in self.source_instructions.items():
                 if instructions:
-                    has_project = 'project' in instructions.lower()
-                    has_space = 'space' in instructions.lower()
+                    instructions_lower = instructions.lower()
                     logger.debug("📄 Source instruction details", 
                                source=source_name, 
-                               has_project_filter=has_project,
-                               has_space_filter=has_space,
+                               has_project_filter='project' in instructions_lower,
+                               has_space_filter='space' in instructions_lower,
                                instruction_length=len(instructions))
-        else:
-            logger.info("❌ No source instructions found")
         
         # Classify tools for routing
         self._classify_tools()
         
-        logger.info("FastMCP tools loaded and classified for specific sources", 
+        # One summary event for the whole load
+        logger.info(loaded_event, 
                    tool_count=tool_count, 
                    sources=len(self.loaded_sources),
+                   instruction_count=len(self.source_instructions),
                    local_tools=len(self.local_tools),
                    remote_tools=len(self.remote_tools))
         return tool_count
@@ -198,19 +226,16 @@ class FastMCPAgent:
             source_id = tool.metadata.get('source_id')
             if source_id:
                 # Find the source URL from loaded server configs
-                for config in self.tool_manager.server_configs:
-                    if config.source_id == source_id:
-                        source_url = config.server_url.lower()
-                        
-                        # Check for Scintilla local schemes
-                        for scheme in SCINTILLA_LOCAL_SCHEMES:
-                            if source_url.startswith(scheme):
-                                logger.info(f"✅ Tool {tool.name} marked as LOCAL due to scheme '{scheme}' in {source_url}")
-                                return True
-                        
-                        # If no local scheme found, it's remote
-                        logger.debug(f"☁️ Tool {tool.name} marked as REMOTE - URL: {source_url}")
-                        return False
+                config = self.tool_manager.server_configs_by_id.get(source_id)
+                if config is not None:
+                    # Scintilla local scheme check is precomputed per source config
+                    if config.is_local:
+                        logger.info(f"✅ Tool {tool.name} marked as LOCAL due to scheme in {config.server_url}")
+                        return True
+                    
+                    # If no local scheme found, it's remote
+                    logger.debug(f"☁️ Tool {tool.name} marked as REMOTE - URL: {config.server_url}")
+                    return False
         
         # No source metadata found - assume remote for safety
         logger.warning(f"⚠️ Tool {tool.name} has no source metadata - assuming REMOTE")
@@ -243,20 +268,18 @@ class FastMCPAgent:
     ) -> List[Any]:
         """Load conversation history for context (enhanced for better follow-up handling)"""
         try:
+            # Only role and content are used: select just those columns instead of
+            # hydrating full rows (with their JSONB tool/citation payloads)
             result = await db.execute(
-                select(Message)
+                select(Message.role, Message.content)
                 .where(Message.conversation_id == conversation_id)
                 .order_by(Message.created_at.desc())
                 .limit(10)  # Increased from 6 to 10 for better context
             )
-            messages = list(reversed(result.scalars().all()))
+            messages = list(reversed(result.all()))
             
             langchain_messages = []
-            for msg in messages:
-                # Extract data early to avoid greenlet issues
-                role = msg.role
-                content = msg.content
-                
+            for role, content in messages:
                 if role == "user":
                     langchain_messages.append(HumanMessage(content=content))
                 elif role == "assistant":
@@ -460,8 +483,6 @@ class FastMCPAgent:
         
         BE CAREFUL: Only remove specific problematic patterns, not legitimate content.
         """
-        import re
-        
         if not isinstance(content, str):
             content = str(content)
         
@@ -484,8 +505,6 @@ class FastMCPAgent:
     
     def _create_llm(self, llm_provider: str, llm_model: str):
         """Create LLM instance"""
-        import os
-        
         if llm_provider == "anthropic":
             api_key = os.getenv("ANTHROPIC_API_KEY")
             if not api_key:
@@ -508,6 +527,52 @@ class FastMCPAgent:
         else:
             raise ValueError(f"Unsupported LLM provider: {llm_provider}")
     
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _render_tool_info(name: str, description: str, args_schema: Any) -> Tuple[str, Tuple[str, ...]]:
+        """
+        Render a tool's system prompt entry and its query language guidance
+        
+        Tools (and their args models) are shared across queries and never change
+        after construction, so the schema walk is memoized per tool instead of
+        being redone for every query.
+        """
+        tool_line = f"- {name}: {description}"
+        query_language_guidance = []
+        
+        # Extract important parameter descriptions that contain examples or syntax guidance
+        if args_schema:
+            param_descriptions = []
+            if hasattr(args_schema, 'model_fields'):
+                # Pydantic v2
+                for field_name, field_info in args_schema.model_fields.items():
+                    if hasattr(field_info, 'description') and field_info.description:
+                        desc = field_info.description
+                        # Include descriptions that contain examples or important syntax info
+                        if _PARAM_GUIDANCE_RE.search(desc.lower()):
+                            param_descriptions.append(f"  • {field_name}: {desc}")
+                            
+                            # Detect query language patterns and extract specific guidance
+                            FastMCPAgent._extract_query_language_guidance(field_name, desc, query_language_guidance)
+                            
+            elif hasattr(args_schema, '__fields__'):
+                # Pydantic v1
+                for field_name, field_info in args_schema.__fields__.items():
+                    if hasattr(field_info, 'field_info') and hasattr(field_info.field_info, 'description'):
+                        desc = field_info.field_info.description
+                        # Include descriptions that contain examples or important syntax info
+                        if _PARAM_GUIDANCE_RE.search(desc.lower()):
+                            param_descriptions.append(f"  • {field_name}: {desc}")
+                            
+                            # Detect query language patterns and extract specific guidance
+                            FastMCPAgent._extract_query_language_guidance(field_name, desc, query_language_guidance)
+            
+            # Add parameter descriptions if we found any with examples
+            if param_descriptions:
+                tool_line += "\n" + "\n".join(param_descriptions)
+        
+        return tool_line, tuple(query_language_guidance)
+    
     def _create_system_prompt(self, search_tools: List[BaseTool]) -> str:
         """Create system prompt for LLM"""
         # Enhanced tools info that includes parameter descriptions with examples
@@ -515,40 +580,11 @@ class FastMCPAgent:
         query_language_guidance = []  # Collect specific guidance for query languages
         
         for tool in search_tools:
-            tool_line = f"- {tool.name}: {tool.description}"
-            
-            # Extract important parameter descriptions that contain examples or syntax guidance
-            if hasattr(tool, 'args_schema') and tool.args_schema:
-                param_descriptions = []
-                if hasattr(tool.args_schema, 'model_fields'):
-                    # Pydantic v2
-                    for field_name, field_info in tool.args_schema.model_fields.items():
-                        if hasattr(field_info, 'description') and field_info.description:
-                            desc = field_info.description
-                            # Include descriptions that contain examples or important syntax info
-                            if any(keyword in desc.lower() for keyword in ['example', 'syntax', 'format', 'language', 'query']):
-                                param_descriptions.append(f"  • {field_name}: {desc}")
-                                
-                                # Detect query language patterns and extract specific guidance
-                                self._extract_query_language_guidance(field_name, desc, query_language_guidance)
-                                
-                elif hasattr(tool.args_schema, '__fields__'):
-                    # Pydantic v1
-                    for field_name, field_info in tool.args_schema.__fields__.items():
-                        if hasattr(field_info, 'field_info') and hasattr(field_info.field_info, 'description'):
-                            desc = field_info.field_info.description
-                            # Include descriptions that contain examples or important syntax info
-                            if any(keyword in desc.lower() for keyword in ['example', 'syntax', 'format', 'language', 'query']):
-                                param_descriptions.append(f"  • {field_name}: {desc}")
-                                
-                                # Detect query language patterns and extract specific guidance
-                                self._extract_query_language_guidance(field_name, desc, query_language_guidance)
-                
-                # Add parameter descriptions if we found any with examples
-                if param_descriptions:
-                    tool_line += "\n" + "\n".join(param_descriptions)
-            
+            tool_line, tool_guidance = self._render_tool_info(
+                tool.name, tool.description, getattr(tool, 'args_schema', None)
+            )
             tools_info.append(tool_line)
+            query_language_guidance.extend(tool_guidance)
         
         tools_context = "\n".join(tools_info)
         server_context = ", ".join(self.loaded_sources)
@@ -673,36 +709,27 @@ Be intelligent about tool usage - search when information is needed, respond dir
         
         # Categorize available tools
         for tool in available_tools:
-            tool_name_lower = tool.name.lower()
-            
-            if any(keyword in tool_name_lower for keyword in ['jira', 'github', 'ticket', 'issue', 'bug']):
-                tool_types["tickets"].append(tool.name)
-            elif any(keyword in tool_name_lower for keyword in ['gmail', 'email', 'slack', 'teams', 'chat']):
-                tool_types["communications"].append(tool.name)
-            elif any(keyword in tool_name_lower for keyword in ['confluence', 'wiki', 'documentation', 'docs']):
-                tool_types["documentation"].append(tool.name)
-            elif any(keyword in tool_name_lower for keyword in ['github', 'gitlab', 'git', 'repository', 'code']):
-                tool_types["code"].append(tool.name)
-            elif any(keyword in tool_name_lower for keyword in ['file', 'document', 'storage']):
-                tool_types["files"].append(tool.name)
+            source_type = _classify_tool_source_type(tool.name)
+            if source_type:
+                tool_types[source_type].append(tool.name)
         
         # Analyze query patterns to suggest relevant source types
         suggested_types = []
         
         # Status/integration queries benefit from multiple sources
-        if any(keyword in query_lower for keyword in ['status', 'integration', 'progress', 'update', 'current']):
+        if _STATUS_QUERY_RE.search(query_lower):
             suggested_types.extend(["tickets", "communications", "documentation"])
         
         # Technical issue queries
-        elif any(keyword in query_lower for keyword in ['error', 'bug', 'issue', 'problem', 'failure', 'not working']):
+        elif _ISSUE_QUERY_RE.search(query_lower):
             suggested_types.extend(["tickets", "communications", "documentation"])
         
         # Implementation/how-to queries
-        elif any(keyword in query_lower for keyword in ['how', 'implement', 'setup', 'configure', 'install']):
+        elif _HOWTO_QUERY_RE.search(query_lower):
             suggested_types.extend(["documentation", "code", "communications"])
         
         # Project/planning queries
-        elif any(keyword in query_lower for keyword in ['project', 'plan', 'roadmap', 'timeline', 'milestone']):
+        elif _PROJECT_QUERY_RE.search(query_lower):
             suggested_types.extend(["tickets", "communications", "documentation"])
         
         # Default: suggest tickets and documentation as baseline
@@ -722,7 +749,8 @@ Be intelligent about tool usage - search when information is needed, respond dir
         
         return relevant_sources
 
-    def _extract_query_language_guidance(self, field_name: str, description: str, guidance_list: List[str]) -> None:
+    @staticmethod
+    def _extract_query_language_guidance(field_name: str, description: str, guidance_list: List[str]) -> None:
         """Extract specific query language guidance from parameter descriptions"""
         desc_lower = description.lower()
         field_lower = field_name.lower()
@@ -749,9 +777,6 @@ Be intelligent about tool usage - search when information is needed, respond dir
         Parse text-based <invoke> syntax into LangChain tool call format
         Handles cases where LLM generates <invoke name="tool"><parameter name="param">value</parameter></invoke>
         """
-        import re
-        import uuid
-        
         tool_calls = []
         
         # Find all <invoke> blocks
@@ -868,100 +893,106 @@ Be intelligent about tool usage - search when information is needed, respond dir
         message: str
     ) -> Tuple[List[ToolMessage], List[Dict], List[Dict]]:
         """Execute tool calls and return results with metadata for flexible citation handling"""
+        # Tool calls from one LLM step are independent, so run them concurrently
+        # (wall-clock is the slowest call instead of the sum); results keep call order
+        outcomes = await asyncio.gather(*(self._execute_tool_call(tool_call) for tool_call in tool_calls))
+        
         tool_results = []
         tools_called = []
         tool_metadata = []  # Collect metadata for citation processing
         
-        for tool_call in tool_calls:
-            tool_name = tool_call['name']
-            tool_args = tool_call['args']
-            
-            try:
-                # Find the tool by name
-                target_tool = None
-                for tool in self.tools:
-                    if tool.name == tool_name:
-                        target_tool = tool
-                        break
-                
-                if not target_tool:
-                    error_result = f"Tool '{tool_name}' not found"
-                    tools_called.append({
-                        "tool": tool_name,
-                        "arguments": tool_args,
-                        "error": error_result
-                    })
-                    
-                    tool_message = ToolMessage(
-                        content=error_result,
-                        tool_call_id=tool_call['id']
-                    )
-                    tool_results.append(tool_message)
-                    continue
-                
-                # Route to local or remote execution
-                if self._is_local_tool(target_tool):
-                    # Execute via local agents
-                    logger.info(f"🏠 Executing local tool: {tool_name}", args=tool_args)
-                    tool_result = await self._execute_local_tool(tool_name, tool_args)
-                else:
-                    # Execute via remote MCP (existing logic)
-                    logger.info(f"☁️ Executing remote tool: {tool_name}", args=tool_args)
-                    tool_result = await target_tool.ainvoke(tool_args)
-                
-                # Process tool result to extract metadata (flexible approach)
-                from src.agents.tool_result_processor import ToolResultProcessor
-                metadata = ToolResultProcessor.process_tool_result(
-                    tool_name=tool_name,
-                    tool_result=tool_result,
-                    tool_params=tool_args
-                )
-                
-                # Store metadata for later citation processing
-                tool_metadata.append({
-                    "tool_name": tool_name,
-                    "tool_args": tool_args,
-                    "metadata": metadata.to_dict(),
-                    "raw_result": str(tool_result)
-                })
-                
-                logger.info(
-                    f"📊 Tool metadata extracted",
-                    tool=tool_name,
-                    urls=len(metadata.urls),
-                    titles=len(metadata.titles),
-                    identifiers=list(metadata.identifiers.keys())
-                )
-                
-                tools_called.append({
-                    "tool": tool_name,
-                    "arguments": tool_args,
-                    "result": str(tool_result)
-                })
-                
-                # Create tool message for conversation
+        for tool_message, call_record, metadata_record in outcomes:
+            tool_results.append(tool_message)
+            tools_called.append(call_record)
+            if metadata_record is not None:
+                tool_metadata.append(metadata_record)
+        
+        return tool_results, tools_called, tool_metadata
+    
+    async def _execute_tool_call(self, tool_call: Dict) -> Tuple[ToolMessage, Dict, Optional[Dict]]:
+        """Execute a single tool call; returns (tool message, call record, citation metadata or None)"""
+        tool_name = tool_call['name']
+        tool_args = tool_call['args']
+        
+        try:
+            # Find the tool by name
+            target_tool = None
+            for tool in self.tools:
+                if tool.name == tool_name:
+                    target_tool = tool
+                    break
+            
+            if not target_tool:
+                error_result = f"Tool '{tool_name}' not found"
                 tool_message = ToolMessage(
-                    content=str(tool_result),
+                    content=error_result,
                     tool_call_id=tool_call['id']
                 )
-                tool_results.append(tool_message)
-                
-            except Exception as e:
-                error_result = f"Tool execution failed: {str(e)}"
-                
-                tools_called.append({
+                return tool_message, {
                     "tool": tool_name,
                     "arguments": tool_args,
-                    "error": str(e)
-                })
-                
-                tool_message = ToolMessage(
-                    content=error_result,
-                    tool_call_id=tool_call['id']
-                )
-                tool_results.append(tool_message)
-        
-        return tool_results, tools_called, tool_metadata
+                    "error": error_result
+                }, None
+            
+            # Route to local or remote execution
+            if self._is_local_tool(target_tool):
+                # Execute via local agents
+                logger.info(f"🏠 Executing local tool: {tool_name}", args=tool_args)
+                tool_result = await self._execute_local_tool(tool_name, tool_args)
+            else:
+                # Execute via remote MCP (existing logic)
+                logger.info(f"☁️ Executing remote tool: {tool_name}", args=tool_args)
+                tool_result = await target_tool.ainvoke(tool_args)
+            
+            # Stringify once: local agents may return structured results, whose repr is
+            # as large as the result and was otherwise rebuilt for every use below
+            tool_result_str = tool_result if isinstance(tool_result, str) else str(tool_result)
+            
+            # Process tool result to extract metadata (flexible approach)
+            metadata = ToolResultProcessor.process_tool_result(
+                tool_name=tool_name,
+                tool_result=tool_result_str,
+                tool_params=tool_args
+            )
+            
+            logger.info(
+                f"📊 Tool metadata extracted",
+                tool=tool_name,
+                urls=len(metadata.urls),
+                titles=len(metadata.titles),
+                identifiers=list(metadata.identifiers.keys())
+            )
+            
+            # Create tool message for conversation
+            tool_message = ToolMessage(
+                content=tool_result_str,
+                tool_call_id=tool_call['id']
+            )
+            
+            return tool_message, {
+                "tool": tool_name,
+                "arguments": tool_args,
+                "result": tool_result_str
+            }, {
+                # Stored for later citation processing
+                "tool_name": tool_name,
+                "tool_args": tool_args,
+                "metadata": metadata.to_dict(),
+                "raw_result": tool_result_str
+            }
+            
+        except Exception as e:
+            error_result = f"Tool execution failed: {str(e)}"
+            
+            tool_message = ToolMessage(
+                content=error_result,
+                tool_call_id=tool_call['id']
+            )
+            return tool_message, {
+                "tool": tool_name,
+                "arguments": tool_args,
+                "error": str(e)
+            }, None
     
     async def query(
         self,
@@ -972,7 +1003,10 @@ Be intelligent about tool usage - search when information is needed, respond dir
         db_session: Optional[AsyncSession] = None
     ) -> AsyncGenerator[Dict[str, Any], None]:
         """Execute query with streaming response and context size management"""
+        # Start/end points in timings are epoch seconds (sent to clients in raw_timings);
+        # the total and the per-call durations are measured with the monotonic perf_counter
         query_start = time.time()
+        query_start_perf = time.perf_counter()
         
         # Performance timing collection
         timings = {
@@ -1085,13 +1119,21 @@ Be intelligent about tool usage - search when information is needed, respond dir
             iteration = 0
             tool_results_str = []  # Collect tool results for context management
             
+            # Running context size: estimated once here, then advanced by what each iteration
+            # appends, instead of re-estimating the whole conversation before every LLM call
+            running_tokens = self.context_manager.estimate_current_context(
+                system_prompt=system_prompt,
+                conversation_history=conversation_history,
+                current_message=message,
+                tool_results=tool_results_str
+            )
+            
             # Track source type coverage for multi-source search encouragement
             source_types_searched = set()
             suggested_source_types = set(suggested_sources.keys()) if suggested_sources else set()
             
             # Create a faster model for tool calling if enabled and using slow model
             fast_llm_with_tools = None
-            from src.config import settings
             
             if (settings.enable_fast_tool_calling and 
                 llm_model == "claude-sonnet-4-20250514" and 
@@ -1102,18 +1144,31 @@ Be intelligent about tool usage - search when information is needed, respond dir
             
             while iteration < MAX_TOOL_ITERATIONS:
                 iteration += 1
-                iteration_start = time.time()
+                iteration_start = time.perf_counter()
                 
-                # Optimize context before each LLM call (but NOT citation context yet)
-                context_opt_start = time.time()
-                optimized_history, optimized_tool_results, _ = self.context_manager.optimize_context(
-                    system_prompt=system_prompt,
-                    conversation_history=conversation_history,
-                    current_message=message,
-                    tool_results=tool_results_str,
-                    citation_context=""  # Don't add citation context during tool iterations
-                )
-                context_opt_end = time.time()
+                # Optimize context before each LLM call (but NOT citation context yet).
+                # Within the safe limit optimization is a no-op, so only a full pass is
+                # needed once the running count says the context overflows.
+                context_opt_start = time.perf_counter()
+                if running_tokens <= self.context_manager.model_limits.safe_limit:
+                    optimized_history = conversation_history
+                    estimated_tokens = running_tokens
+                else:
+                    optimized_history, optimized_tool_results, _ = self.context_manager.optimize_context(
+                        system_prompt=system_prompt,
+                        conversation_history=conversation_history,
+                        current_message=message,
+                        tool_results=tool_results_str,
+                        citation_context=""  # Don't add citation context during tool iterations
+                    )
+                    estimated_tokens = self.context_manager.estimate_current_context(
+                        system_prompt=system_prompt,
+                        conversation_history=optimized_history,
+                        current_message=message,
+                        tool_results=optimized_tool_results,
+                        citation_context=""
+                    )
+                context_opt_end = time.perf_counter()
                 timings["context_optimization"].append({
                     "iteration": iteration,
                     "duration": context_opt_end - context_opt_start
@@ -1131,22 +1186,15 @@ Be intelligent about tool usage - search when information is needed, respond dir
                 messages = self._validate_message_sequence_for_claude(messages)
                 
                 # Log context usage
-                estimated_tokens = self.context_manager.estimate_current_context(
-                    system_prompt=system_prompt,
-                    conversation_history=optimized_history,
-                    current_message=message,
-                    tool_results=optimized_tool_results,
-                    citation_context=""
-                )
                 logger.info(f"Context usage: ~{estimated_tokens} tokens (iteration {iteration})")
                 
                 # Get LLM response - use faster model for tool calling if available
-                llm_call_start = time.time()
+                llm_call_start = time.perf_counter()
                 current_llm_with_tools = fast_llm_with_tools if fast_llm_with_tools else llm_with_tools
                 model_used = settings.fast_tool_calling_model if fast_llm_with_tools else llm_model
                 logger.info(f"🧠 Using model: {model_used} for iteration {iteration}")
                 response = await current_llm_with_tools.ainvoke(messages)
-                llm_call_end = time.time()
+                llm_call_end = time.perf_counter()
                 timings["llm_calls"].append({
                     "iteration": iteration,
                     "duration": llm_call_end - llm_call_start,
@@ -1166,7 +1214,6 @@ Be intelligent about tool usage - search when information is needed, respond dir
                     tool_calls_to_execute = self._parse_invoke_syntax(response.content)
                     
                     # Clean up the response content by removing <invoke> blocks
-                    import re
                     cleaned_content = re.sub(r'<invoke name="[^"]+">.*?</invoke>', '', response.content, flags=re.DOTALL)
                     response.content = cleaned_content.strip()
                 
@@ -1184,11 +1231,11 @@ Be intelligent about tool usage - search when information is needed, respond dir
                         }
                     
                     # Execute tools and get results with metadata
-                    tools_exec_start = time.time()
+                    tools_exec_start = time.perf_counter()
                     tool_results, call_results, tool_metadata = await self._execute_tool_calls(
                         tool_calls_to_execute, message
                     )
-                    tools_exec_end = time.time()
+                    tools_exec_end = time.perf_counter()
                     
                     # Record individual tool call timings
                     for i, tool_call in enumerate(tool_calls_to_execute):
@@ -1204,17 +1251,9 @@ Be intelligent about tool usage - search when information is needed, respond dir
                     
                     # Track source types that have been searched
                     for tool_call in tool_calls_to_execute:
-                        tool_name = tool_call['name'].lower()
-                        if any(keyword in tool_name for keyword in ['jira', 'github', 'ticket', 'issue', 'bug']):
-                            source_types_searched.add("tickets")
-                        elif any(keyword in tool_name for keyword in ['gmail', 'email', 'slack', 'teams', 'chat']):
-                            source_types_searched.add("communications")
-                        elif any(keyword in tool_name for keyword in ['confluence', 'wiki', 'documentation', 'docs']):
-                            source_types_searched.add("documentation")
-                        elif any(keyword in tool_name for keyword in ['github', 'gitlab', 'git', 'repository', 'code']):
-                            source_types_searched.add("code")
-                        elif any(keyword in tool_name for keyword in ['file', 'document', 'storage']):
-                            source_types_searched.add("files")
+                        source_type = _classify_tool_source_type(tool_call['name'])
+                        if source_type:
+                            source_types_searched.add(source_type)
                     
                     # Collect tool result strings for context management
                     for result in call_results:
@@ -1223,6 +1262,7 @@ Be intelligent about tool usage - search when information is needed, respond dir
                             # Truncate large tool results immediately
                             truncated_result = self.context_manager.truncate_tool_result(tool_result_str)
                             tool_results_str.append(truncated_result)
+                            running_tokens += TokenEstimator.estimate_tokens(truncated_result)
                     
                     # Stream tool results
                     for result in call_results:
@@ -1245,11 +1285,12 @@ Be intelligent about tool usage - search when information is needed, respond dir
                     content_str = ""
                     if response.content:
                         content_str = response.content if isinstance(response.content, str) else str(response.content)
-                    conversation_history.append(AIMessage(content=content_str, tool_calls=tool_calls_to_execute))
-                    conversation_history.extend(tool_results)
+                    new_messages = [AIMessage(content=content_str, tool_calls=tool_calls_to_execute), *tool_results]
+                    conversation_history.extend(new_messages)
+                    running_tokens += self.context_manager.estimate_history_tokens(new_messages)
                     
                     # Record iteration timing
-                    iteration_end = time.time()
+                    iteration_end = time.perf_counter()
                     timings["iterations"].append({
                         "iteration": iteration,
                         "duration": iteration_end - iteration_start,
@@ -1283,10 +1324,12 @@ Be intelligent about tool usage - search when information is needed, respond dir
                         # Add a guidance message to conversation to encourage more searching
                         coverage_guidance = f"""I've searched {list(source_types_searched)} but should also check {list(unsearched_types)} for comprehensive coverage. Let me search additional source types to provide a complete answer."""
                         
-                        conversation_history.append(AIMessage(content=coverage_guidance))
+                        guidance_message = AIMessage(content=coverage_guidance)
+                        conversation_history.append(guidance_message)
+                        running_tokens += self.context_manager.estimate_history_tokens([guidance_message])
                         
                         # Record iteration timing and continue
-                        iteration_end = time.time()
+                        iteration_end = time.perf_counter()
                         timings["iterations"].append({
                             "iteration": iteration,
                             "duration": iteration_end - iteration_start,
@@ -1312,7 +1355,7 @@ Be intelligent about tool usage - search when information is needed, respond dir
                             conversation_history.append(AIMessage(content=content_str))
                         
                         # Record final iteration timing (no tools called)
-                        iteration_end = time.time()
+                        iteration_end = time.perf_counter()
                         timings["iterations"].append({
                             "iteration": iteration,
                             "duration": iteration_end - iteration_start,
@@ -1367,10 +1410,10 @@ IMPORTANT: Use markdown links exactly as shown above when citing these sources.
                 if hasattr(msg, 'tool_call_id'):
                     logger.info(f"    Tool call ID: {msg.tool_call_id}")
             
-            final_llm_start = time.time()
+            final_llm_start = time.perf_counter()
             try:
                 final_response = await llm.ainvoke(final_messages)
-                final_llm_end = time.time()
+                final_llm_end = time.perf_counter()
                 timings["llm_calls"].append({
                     "iteration": "final",
                     "duration": final_llm_end - final_llm_start,
@@ -1390,7 +1433,7 @@ IMPORTANT: Use markdown links exactly as shown above when citing these sources.
                 # final_content = self._clean_final_response(final_content)
             except asyncio.TimeoutError:
                 # Handle timeout gracefully with a fallback response
-                final_llm_end = time.time()
+                final_llm_end = time.perf_counter()
                 timings["llm_calls"].append({
                     "iteration": "final",
                     "duration": final_llm_end - final_llm_start,
@@ -1454,7 +1497,6 @@ IMPORTANT: Use markdown links exactly as shown above when citing these sources.
                 final_content = iteration_feedback + final_content
             
             # Remove any <SOURCES> sections the LLM might have added
-            import re
             if isinstance(final_content, str):
                 final_content = re.sub(r'<SOURCES>.*?</SOURCES>', '', final_content, flags=re.DOTALL).strip()
             elif isinstance(final_content, list):
@@ -1480,7 +1522,7 @@ IMPORTANT: Use markdown links exactly as shown above when citing these sources.
             
             # Finalize timing data
             timings["query_end"] = time.time()
-            timings["total_duration"] = timings["query_end"] - timings["query_start"]
+            timings["total_duration"] = time.perf_counter() - query_start_perf
             
             # Generate performance summary table
             performance_summary = self._generate_performance_summary(timings)
@@ -1503,7 +1545,7 @@ IMPORTANT: Use markdown links exactly as shown above when citing these sources.
                     "total_tools_called": total_tools_called,
                     "sources_found": len(sources),
                     "query_type": "fast_mcp_agent",
-                    "response_time_ms": int((time.time() - query_start) * 1000),
+                    "response_time_ms": int((time.perf_counter() - query_start_perf) * 1000),
                     "context_tokens_used": estimated_tokens,
                     "context_optimized": len(conversation_history) != len(optimized_history),
                     "conversation_messages_kept": len(optimized_history) if optimized_history else 0,
@@ -1525,7 +1567,7 @@ IMPORTANT: Use markdown links exactly as shown above when citing these sources.
             
             # Generate performance data even on error
             timings["query_end"] = time.time()
-            timings["total_duration"] = timings["query_end"] - timings["query_start"]
+            timings["total_duration"] = time.perf_counter() - query_start_perf
             performance_summary = self._generate_performance_summary(timings)
             
             yield {
@@ -1614,8 +1656,6 @@ IMPORTANT: Use markdown links exactly as shown above when citing these sources.
     
     def _build_sources_from_metadata(self, tool_metadata: List[Dict], final_content: str) -> List[Dict]:
         """Build sources list from tool metadata, filtered by what's actually cited"""
-        import re
-        
         # Find all citation references in the final content
         citation_pattern = r'\[(\d+)\]'
         referenced_citations = set()
@@ -1706,8 +1746,6 @@ IMPORTANT: Use markdown links exactly as shown above when citing these sources.
 
     def _build_sources_from_metadata_simple(self, tool_metadata: List[Dict], final_content: str) -> List[Dict]:
         """Build simple sources list from tool metadata for markdown links"""
-        import re
-        
         # Find all markdown links in the final content
         # Use non-greedy match to handle titles with nested brackets like [Title with [brackets]]
         markdown_pattern = r'\[(.*?)\]\(([^)]+)\)'
@@ -1845,8 +1883,6 @@ CRITICAL: Return ONLY the corrected response content. Do NOT add sections like "
         """
         Generate dynamic examples based on actual business context to avoid hardcoded references
         """
-        import re  # Move import to top
-        
         # Extract project and space names from the actual context
         project_names = []
         space_names = []
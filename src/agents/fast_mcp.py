@@ -14,37 +14,577 @@ Key Features:
 
 import uuid
 import json
+import hashlib
 import asyncio
 import time
-from typing import Dict, List, Any, Optional, Tuple
-from dataclasses import dataclass
+import operator
+import random
+import re
+from typing import Dict, List, Any, Optional, Tuple, Type, AsyncIterator, Awaitable, Callable, Iterable
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from functools import lru_cache, partial
+from contextlib import asynccontextmanager
 from datetime import datetime, timezone
-from urllib.parse import urlparse, urlencode, urlunparse, parse_qs
+from urllib.parse import urlparse, parse_qs
 
+import orjson
 import structlog
 from fastmcp import Client as FastMCPClient
 from mcp import ClientSession
 from mcp.client.sse import sse_client
+from mcp.shared.exceptions import McpError
+from mcp.types import CONNECTION_CLOSED
+import anyio
 import httpx
 from langchain_core.tools import BaseTool, Tool
 from langchain.tools import StructuredTool
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, create_model
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update
+from sqlalchemy import Row, select, update, delete, func, or_, any_, bindparam
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import DBAPIError
 
+from src.config import settings
+from src.db.base import AsyncSessionLocal
+from src.db.queries import UUID_ARRAY, uuid_in
 from src.db.models import Source, SourceTool, BotSourceAssociation
 from src.db.mcp_credentials import SimplifiedCredentialManager
 
 logger = structlog.get_logger()
 
+# JSON Schema type -> Python type for generated tool args models
+_JSON_SCHEMA_TYPES = {
+    "string": str,
+    "integer": int,
+    "number": float,
+    "boolean": bool,
+}
 
-@dataclass
+_get_text = operator.attrgetter("text")
+
+# Keyword heuristics for classifying search/read-only tools (substring matches, so
+# "get" also hits "jira_get_issue" and "searchEmails")
+SEARCH_KEYWORDS = frozenset({
+    'search', 'get', 'list', 'find', 'read', 'fetch', 'query', 'lookup',
+    'retrieve', 'browse', 'view', 'show', 'describe', 'info'
+})
+
+DESTRUCTIVE_KEYWORDS = frozenset({
+    'delete', 'remove', 'create', 'update', 'modify', 'write', 'post',
+    'put', 'patch', 'edit', 'change', 'set', 'insert', 'add'
+})
+
+# One alternation per keyword set: each scan is a single C-level pass over the text
+_SEARCH_KEYWORDS_RE = re.compile("|".join(map(re.escape, sorted(SEARCH_KEYWORDS))))
+_DESTRUCTIVE_KEYWORDS_RE = re.compile("|".join(map(re.escape, sorted(DESTRUCTIVE_KEYWORDS))))
+
+
+def _is_search_readonly(name: str, description: Optional[str]) -> bool:
+    """Whether a tool looks like a search/read-only tool and not a destructive one"""
+    # Name and description scanned as one string; the NUL separator keeps
+    # keywords from matching across the field boundary
+    haystack = f"{name}\x00{description or ''}".lower()
+    
+    # Destructive first: a hit rejects the tool without scanning for search keywords
+    if _DESTRUCTIVE_KEYWORDS_RE.search(haystack):
+        return False
+    
+    return _SEARCH_KEYWORDS_RE.search(haystack) is not None
+
+# Failures worth retrying: dropped/refused connections and closed pooled streams.
+# Anything else (server-side MCP errors, bad arguments, auth) fails the same way again.
+_TRANSIENT_ERRORS = (
+    asyncio.TimeoutError,
+    httpx.TransportError,
+    anyio.ClosedResourceError,
+    anyio.BrokenResourceError,
+    anyio.EndOfStream,
+    ConnectionError
+)
+
+# MCP error codes the client session itself raises for transport failures: a dropped
+# stream fails every in-flight request with CONNECTION_CLOSED, and a response read
+# timeout is reported as HTTP 408. Server-sent MCP errors are not retried.
+_TRANSIENT_MCP_ERROR_CODES = frozenset((CONNECTION_CLOSED, httpx.codes.REQUEST_TIMEOUT))
+
+# Retry backoff: exponential from the base delay, capped, with +/-25% jitter
+RETRY_BASE_DELAY_SECONDS = 0.5
+RETRY_MAX_DELAY_SECONDS = 8.0
+
+
+def _is_transient_error(error: BaseException) -> bool:
+    """Whether a tool call failure is worth retrying"""
+    if isinstance(error, BaseExceptionGroup):
+        # anyio task groups (sse_client) wrap the underlying transport errors
+        return all(_is_transient_error(e) for e in error.exceptions)
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code == 429 or error.response.status_code >= 500
+    if isinstance(error, McpError):
+        return error.error.code in _TRANSIENT_MCP_ERROR_CODES
+    return isinstance(error, _TRANSIENT_ERRORS)
+
+
+def _is_invalid_cached_statement(error: DBAPIError) -> bool:
+    """Whether a DB error is asyncpg's stale prepared statement error (schema changed)"""
+    return type(error.orig).__name__ == "InvalidCachedStatementError"
+
+
+def _retry_delay(attempt: int) -> float:
+    """Jittered exponential backoff before retry number `attempt` (1-based)"""
+    delay = min(RETRY_BASE_DELAY_SECONDS * (2 ** (attempt - 1)), RETRY_MAX_DELAY_SECONDS)
+    return delay * random.uniform(0.75, 1.25)
+
+# Generated tool args models keyed by a digest of their canonical JSON schema; LRU-bounded
+# since schemas of removed or changed tools would otherwise accumulate for the process lifetime
+ARGS_SCHEMA_CACHE_MAXSIZE = 4096
+_ARGS_SCHEMA_CACHE: "OrderedDict[bytes, Type[BaseModel]]" = OrderedDict()
+
+# Shared args model for tools whose schema declares no properties (no-parameter tools)
+_EMPTY_ARGS_SCHEMA: Type[BaseModel] = create_model("EmptyArgs")
+
+# Rows fetched per round trip when streaming cached tools
+CACHED_TOOLS_YIELD_PER = 256
+
+# Cached tool rows per source, validated against Source.tools_last_cached_at (which
+# every refresh bumps); the TTL is only a safety net for out-of-band table edits.
+# Entries also keep the LangChain tools last built from the rows together with the
+# server config they were built for, so agents of later queries (a new tool manager
+# per query) reuse them as long as the source's name, URL and credentials are unchanged.
+# Bounded LRU: stale entries are dropped when read, and sources that are never read
+# again (deleted, or no longer used) age out instead of keeping their configs and
+# credentials alive.
+SOURCE_TOOL_ROWS_CACHE_TTL_SECONDS = 300.0
+SOURCE_TOOL_ROWS_CACHE_MAXSIZE = 1024
+# (tools_last_cached_at, expiry, rows, (config, tools built for it) or None)
+_SourceToolRowsEntry = Tuple[
+    Optional[datetime], float, List[Row], Optional[Tuple["MCPServerConfig", List[BaseTool]]]
+]
+_source_tool_rows_cache: "OrderedDict[uuid.UUID, _SourceToolRowsEntry]" = OrderedDict()
+
+
+def _store_source_tool_rows(source_id: uuid.UUID, entry: _SourceToolRowsEntry) -> None:
+    """Cache a source's tool rows as most recently used, evicting beyond the max size"""
+    _source_tool_rows_cache[source_id] = entry
+    _source_tool_rows_cache.move_to_end(source_id)
+    while len(_source_tool_rows_cache) > SOURCE_TOOL_ROWS_CACHE_MAXSIZE:
+        _source_tool_rows_cache.popitem(last=False)
+
+
+# URL schemes routed to local agents instead of remote SSE servers
+LOCAL_URL_SCHEMES = ("local://", "stdio://", "agent://")
+
+# Overall deadlines (including connect/initialize) for connection tests and tool discovery
+CONNECTION_TEST_TIMEOUT_SECONDS = 15.0
+TOOL_DISCOVERY_TIMEOUT_SECONDS = 30.0
+
+# Successful connection test results, reused for repeated UI pings of the same server
+CONNECTION_TEST_CACHE_TTL_SECONDS = 30.0
+_connection_test_cache: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], Tuple[float, Dict[str, Any]]] = {}
+
+
+# Any character str.isalnum() rejects (\W is its complement plus "_"); each one becomes "_"
+_UNSAFE_NAME_CHAR_RE = re.compile(r"[\W_]")
+
+
+# Hot agent-bootstrap statements, built once: only the bound ID arrays vary per call
+_CACHED_TOOL_ROWS_STMT = select(
+    SourceTool.source_id,
+    SourceTool.tool_name,
+    SourceTool.tool_description,
+    SourceTool.tool_schema
+).where(
+    SourceTool.source_id == any_(bindparam("source_ids", type_=UUID_ARRAY)),
+    SourceTool.is_active.is_(True)
+).execution_options(yield_per=CACHED_TOOLS_YIELD_PER)
+
+_BOT_INSTRUCTIONS_STMT = select(
+    BotSourceAssociation.source_id,
+    BotSourceAssociation.custom_instructions
+).where(
+    BotSourceAssociation.source_id == any_(bindparam("source_ids", type_=UUID_ARRAY)),
+    BotSourceAssociation.bot_id == any_(bindparam("bot_ids", type_=UUID_ARRAY)),  # CRITICAL: Only from selected bots
+    BotSourceAssociation.custom_instructions.isnot(None),
+    BotSourceAssociation.custom_instructions != ""
+)
+
+
+def _content_text(content_item: Any) -> str:
+    """Text of an MCP result content block (non-text blocks fall back to str())"""
+    try:
+        return _get_text(content_item)
+    except AttributeError:
+        return str(content_item)
+
+
+@lru_cache(maxsize=1024)
+def _parse_sse_endpoint(server_url: str) -> Tuple[str, Optional[str]]:
+    """
+    Split a server URL into the SSE endpoint and any URL-embedded API key
+    
+    Cached per URL: every tool call on a source re-resolves the same URL.
+    
+    Args:
+        server_url: Server URL (may contain ?x-api-key=...)
+        
+    Returns:
+        Tuple of (sse_url, api_key or None)
+    """
+    # Handle URL-embedded authentication (Hive style)
+    if "x-api-key=" in server_url:
+        parsed = urlparse(server_url)
+        query_params = parse_qs(parsed.query)
+        if "x-api-key" not in query_params:
+            return server_url, None
+        # Remove auth from URL for clean SSE connection
+        sse_url = f"{parsed.scheme}://{parsed.netloc}{parsed.path}"
+        if not sse_url.endswith('/sse'):
+            sse_url += '/sse'
+        return sse_url, query_params["x-api-key"][0]
+    
+    # Header-based authentication (Atlassian style): ensure URL ends with /sse
+    if not server_url.endswith('/sse'):
+        return server_url + '/sse', None
+    return server_url, None
+
+
+@dataclass(slots=True, frozen=True)
 class MCPServerConfig:
-    """Configuration for an MCP server connection"""
+    """
+    Configuration for an MCP server connection
+    
+    Read on every tool call; frozen so the derived fields can never go stale.
+    """
     source_id: uuid.UUID
     name: str
     server_url: str
     auth_headers: Optional[Dict[str, str]] = None
+    is_local: bool = field(init=False)
+    auth_fingerprint: Tuple[Tuple[str, str], ...] = field(init=False)
+    safe_name: str = field(init=False)
+    description_prefix: str = field(init=False)
+    
+    def __post_init__(self):
+        # Routed to local agents instead of a remote SSE server; fixed per source
+        object.__setattr__(self, "is_local", self.server_url.lower().startswith(LOCAL_URL_SCHEMES))
+        # Hashable, order-independent form of the credentials for cache keys
+        object.__setattr__(self, "auth_fingerprint", tuple(sorted((self.auth_headers or {}).items())))
+        # Source name as a safe identifier (spaces/special chars replaced with underscores),
+        # used to namespace every tool of the source
+        safe_name = _UNSAFE_NAME_CHAR_RE.sub("_", self.name.lower())
+        object.__setattr__(self, "safe_name", safe_name.strip("_"))  # Remove leading/trailing underscores
+        # Source tag prepended to every tool description of the source
+        object.__setattr__(self, "description_prefix", f"[{self.name}] ")
+
+
+# Keep-alive tuned for long-lived pooled sessions: httpx's default 5s expiry would
+# drop the POST connection between tool calls and pay a new TCP/TLS handshake
+MCP_HTTP_LIMITS = httpx.Limits(max_keepalive_connections=100, max_connections=200, keepalive_expiry=30.0)
+
+
+def _mcp_http_client_factory(
+    headers: Optional[Dict[str, str]] = None,
+    timeout: Optional[httpx.Timeout] = None,
+    auth: Optional[httpx.Auth] = None
+) -> httpx.AsyncClient:
+    """httpx client factory for sse_client (MCP defaults plus pooled keep-alive limits)"""
+    return httpx.AsyncClient(
+        headers=headers,
+        timeout=timeout or httpx.Timeout(30.0, read=300.0),
+        auth=auth,
+        limits=MCP_HTTP_LIMITS
+    )
+
+
+class _PooledSession:
+    """
+    One initialized MCP client session kept open for reuse
+    
+    anyio requires sse_client/ClientSession to be entered and exited in the same
+    task, so a dedicated owner task holds both contexts open until close().
+    """
+    
+    def __init__(self, sse_url: str, headers: Dict[str, str]):
+        self.sse_url = sse_url
+        self.headers = headers
+        self.session: Optional[ClientSession] = None
+        self.in_flight = 0
+        self.retired = False
+        self.last_used = time.monotonic()
+        self._read_stream = None
+        self._closing = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+    
+    async def open(self) -> None:
+        """Connect and initialize the session (raises if the server is unreachable)"""
+        ready = asyncio.get_running_loop().create_future()
+        self._task = asyncio.create_task(self._run(ready))
+        try:
+            self.session = await asyncio.shield(ready)
+        except BaseException:
+            # Cancel instead of close(): a connect that failed, timed out or was cancelled
+            # must not hold the caller past its deadline waiting for the owner task to exit
+            self._closing.set()
+            self._task.cancel()
+            raise
+    
+    async def _run(self, ready: asyncio.Future) -> None:
+        try:
+            async with sse_client(
+                self.sse_url,
+                headers=self.headers,
+                httpx_client_factory=_mcp_http_client_factory
+            ) as (transport_read, transport_write):
+                async with ClientSession(transport_read, transport_write) as session:
+                    await session.initialize()
+                    self._read_stream = transport_read
+                    ready.set_result(session)
+                    await self._closing.wait()
+        except BaseException as e:
+            if not ready.done():
+                if isinstance(e, asyncio.CancelledError):
+                    ready.cancel()
+                else:
+                    ready.set_exception(e)
+            elif not isinstance(e, asyncio.CancelledError):
+                logger.warning("Pooled MCP session ended with error", sse_url=self.sse_url, error=str(e))
+    
+    def is_usable(self, idle_timeout: float) -> bool:
+        """Whether the session is still connected and not idle past the timeout"""
+        if self.retired or self.session is None or self._task is None or self._task.done():
+            return False
+        # The SSE reader closes its end of the read stream when the connection drops
+        if self._read_stream.statistics().open_send_streams == 0:
+            return False
+        return self.in_flight > 0 or time.monotonic() - self.last_used < idle_timeout
+    
+    async def close(self) -> None:
+        """Close the session and wait (briefly) for the owner task to exit"""
+        self._closing.set()
+        if self._task and not self._task.done():
+            try:
+                await asyncio.wait_for(self._task, timeout=5.0)
+            except asyncio.TimeoutError:
+                self._task.cancel()
+            except asyncio.CancelledError:
+                # The caller was cancelled: don't leave the owner task behind, and
+                # don't swallow the caller's cancellation either
+                self._task.cancel()
+                raise
+            except Exception:
+                pass
+
+
+class MCPSessionPool:
+    """
+    Pool of persistent MCP client sessions keyed by SSE URL and headers
+    
+    Reusing a session skips the TCP/TLS connect, SSE handshake and MCP
+    initialize round trips that otherwise precede every tool call. A background
+    task pings idle sessions and closes those idle past idle_timeout; beyond
+    max_sessions the least recently used session is evicted.
+    """
+    
+    def __init__(self, idle_timeout: float = 120.0, keepalive_interval: float = 20.0, max_sessions: int = 256):
+        self.idle_timeout = idle_timeout
+        self.keepalive_interval = keepalive_interval
+        self.max_sessions = max_sessions
+        # Least recently used first
+        self._sessions: "OrderedDict[Tuple[str, Tuple[Tuple[str, str], ...]], _PooledSession]" = OrderedDict()
+        # Connects in progress per key; concurrent borrowers of that key await the same one
+        self._opening: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], asyncio.Future] = {}
+        self._keepalive_task: Optional[asyncio.Task] = None
+    
+    @asynccontextmanager
+    async def session(self, sse_url: str, headers: Dict[str, str]) -> AsyncIterator[ClientSession]:
+        """
+        Borrow an initialized session for sse_url, connecting on first use
+        
+        Sessions are shared by concurrent borrowers. A session whose borrower
+        raises is discarded, so a broken connection is never handed out again.
+        """
+        key = (sse_url, tuple(sorted(headers.items())))
+        pooled = await self._checkout(key, sse_url, headers)
+        
+        # No per-session lock: ClientSession tags each request with its own JSON-RPC
+        # id and routes responses back by id, so concurrent borrowers overlap on one
+        # connection (a fanned-out step costs max RTT instead of the sum)
+        pooled.in_flight += 1
+        try:
+            yield pooled.session
+        except BaseException:
+            # Stop handing the session out; it is closed once its last borrower is done
+            pooled.retired = True
+            if self._sessions.get(key) is pooled:
+                del self._sessions[key]
+            raise
+        finally:
+            pooled.in_flight -= 1
+            pooled.last_used = time.monotonic()
+            if pooled.retired and pooled.in_flight == 0:
+                await pooled.close()
+    
+    async def _checkout(
+        self,
+        key: Tuple[str, Tuple[Tuple[str, str], ...]],
+        sse_url: str,
+        headers: Dict[str, str]
+    ) -> _PooledSession:
+        """
+        Return a usable pooled session for key, connecting if there is none
+        
+        No lock: the lookup and the claim of a connect slot run without an await
+        in between, so they are atomic on the event loop and a hit returns
+        without ever yielding. The connect itself never holds up borrowers of
+        other servers, and concurrent misses on the same key share one attempt.
+        """
+        while True:
+            stale = None
+            pooled = self._sessions.get(key)
+            if pooled is not None and pooled.is_usable(self.idle_timeout):
+                self._sessions.move_to_end(key)
+                return pooled
+            if pooled is not None:
+                stale = pooled
+                del self._sessions[key]
+            
+            opening = self._opening.get(key)
+            is_owner = opening is None
+            if is_owner:
+                opening = asyncio.get_running_loop().create_future()
+                self._opening[key] = opening
+            
+            if not is_owner:
+                if stale is not None:
+                    await self._evict(key, stale)
+                try:
+                    # Shielded: a cancelled waiter must not cancel the shared connect
+                    return await asyncio.shield(opening)
+                except asyncio.CancelledError:
+                    if opening.cancelled():
+                        continue  # The connecting borrower was cancelled; try again
+                    raise
+            
+            pooled = _PooledSession(sse_url, headers)
+            try:
+                # Inside the try: however the evict or connect ends, the claimed
+                # slot is released and its waiters are woken
+                if stale is not None:
+                    await self._evict(key, stale)
+                await pooled.open()
+            except BaseException as e:
+                del self._opening[key]
+                if isinstance(e, asyncio.CancelledError):
+                    opening.cancel()
+                else:
+                    opening.set_exception(e)
+                    opening.exception()  # Retrieved here too, in case nobody else was waiting
+                raise
+            
+            del self._opening[key]
+            self._sessions[key] = pooled
+            opening.set_result(pooled)
+            if self._keepalive_task is None or self._keepalive_task.done():
+                self._keepalive_task = asyncio.create_task(self._keepalive())
+            
+            while len(self._sessions) > self.max_sessions:
+                await self._evict(*next(iter(self._sessions.items())))
+            return pooled
+    
+    async def _keepalive(self) -> None:
+        """Evict stale sessions and ping idle ones until the pool is empty"""
+        while self._sessions:
+            await asyncio.sleep(self.keepalive_interval)
+            
+            for key, pooled in list(self._sessions.items()):
+                if not pooled.is_usable(self.idle_timeout):
+                    await self._evict(key, pooled)
+                    continue
+                
+                if pooled.in_flight:
+                    continue
+                
+                # A failed ping means the server or connection is gone; retire the
+                # session so the next borrower reconnects instead of timing out
+                try:
+                    await asyncio.wait_for(pooled.session.send_ping(), timeout=10.0)
+                except Exception as e:
+                    logger.debug("Pooled MCP session failed keepalive ping", sse_url=pooled.sse_url, error=str(e))
+                    await self._evict(key, pooled)
+    
+    async def _evict(self, key: Tuple[str, Tuple[Tuple[str, str], ...]], pooled: _PooledSession) -> None:
+        """Drop a session from the pool, closing it now or after its last borrower"""
+        pooled.retired = True
+        if self._sessions.get(key) is pooled:
+            del self._sessions[key]
+        if pooled.in_flight == 0:
+            await pooled.close()
+    
+    async def close_all(self) -> None:
+        """Close every pooled session (application shutdown)"""
+        if self._keepalive_task is not None:
+            self._keepalive_task.cancel()
+            self._keepalive_task = None
+        sessions = list(self._sessions.values())
+        self._sessions.clear()
+        await asyncio.gather(*(pooled.close() for pooled in sessions), return_exceptions=True)
+
+
+# Process-wide session pool used for remote tool calls
+mcp_session_pool = MCPSessionPool()
+
+
+class ToolResultCache:
+    """
+    Short-lived LRU cache of read-only tool call results
+    
+    Concurrent identical calls are coalesced onto one in-flight request; only
+    successful results are cached.
+    """
+    
+    def __init__(self, maxsize: int = 512, ttl: float = 30.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[Tuple, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._inflight: Dict[Tuple, asyncio.Future] = {}
+    
+    async def get_or_call(
+        self,
+        key: Tuple,
+        call: Callable[[], Awaitable[Dict[str, Any]]]
+    ) -> Dict[str, Any]:
+        """Return a cached result for key, or run call() (once for concurrent callers)"""
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                return entry[1]
+            del self._entries[key]
+        
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(call())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done, key=key: self._store(key, done))
+        
+        # Shielded so one caller's cancellation doesn't cancel the call for the others
+        return await asyncio.shield(task)
+    
+    def _store(self, key: Tuple, task: asyncio.Future) -> None:
+        self._inflight.pop(key, None)
+        if task.cancelled() or task.exception() is not None:
+            return
+        
+        result = task.result()
+        if result.get("success"):
+            self._entries[key] = (time.monotonic() + self.ttl, result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+
+# Process-wide cache for read-only tool results
+tool_result_cache = ToolResultCache()
 
 
 class FastMCPService:
@@ -59,49 +599,27 @@ class FastMCPService:
     """
     
     @staticmethod
-    def _prepare_auth_for_fastmcp(
-        server_url: str, 
+    def _resolve_endpoint(
+        server_url: str,
         auth_headers: Optional[Dict[str, str]] = None
-    ) -> Tuple[str, Dict[str, Any]]:
+    ) -> Tuple[str, Dict[str, str]]:
         """
-        Prepare authentication for FastMCP client
+        Resolve the SSE URL and request headers for the official MCP client
         
         Args:
-            server_url: Server URL (may already contain embedded auth)
+            server_url: Server URL (may contain embedded auth)
             auth_headers: Optional authentication headers
             
         Returns:
-            Tuple of (final_url, fastmcp_config)
+            Tuple of (sse_url, headers)
         """
-        if not auth_headers or len(auth_headers) == 0:
-            # No headers provided or empty dict - use URL as-is (may have embedded auth)
-            return server_url, {}
-        
-        # Handle different auth methods for FastMCP
-        fastmcp_config = {}
-        
-        if "Authorization" in auth_headers:
-            auth_value = auth_headers["Authorization"]
-            if auth_value.startswith("Bearer "):
-                # For Bearer tokens, pass the full Authorization header value
-                # Some servers (like MCP Atlassian) expect the full "Bearer <token>" format
-                fastmcp_config["headers"] = {"Authorization": auth_value}
-            else:
-                # For other auth types, try passing as auth parameter
-                fastmcp_config["auth"] = auth_value
-        elif "x-api-key" in auth_headers:
-            # For x-api-key, try embedding in URL as FastMCP might expect it there
-            from urllib.parse import urlparse, parse_qs, urlencode, urlunparse
-            parsed = urlparse(server_url)
-            query_params = parse_qs(parsed.query)
-            query_params["x-api-key"] = [auth_headers["x-api-key"]]
-            new_query = urlencode(query_params, doseq=True)
-            server_url = urlunparse(parsed._replace(query=new_query))
-        else:
-            # For any other headers, pass them directly
-            fastmcp_config["headers"] = auth_headers
-        
-        return server_url, fastmcp_config
+        sse_url, api_key = _parse_sse_endpoint(server_url)
+        if api_key is not None:
+            return sse_url, {"x-api-key": api_key}
+        if "x-api-key=" in server_url:
+            # Key parameter present but empty: connect to the URL as given, unauthenticated
+            return sse_url, {}
+        return sse_url, dict(auth_headers) if auth_headers else {}
     
     @staticmethod
     async def test_connection(
@@ -118,60 +636,52 @@ class FastMCPService:
         Returns:
             Dictionary with test results
         """
-        start_time = time.time()
+        cache_key = (server_url, tuple(sorted((auth_headers or {}).items())))
+        cached = _connection_test_cache.get(cache_key)
+        if cached and cached[0] > time.monotonic():
+            return dict(cached[1])
+        
+        start_time = time.perf_counter()
         
         try:
             # Use the same authentication method as tool calls and discovery
-            headers = {}
-            sse_url = server_url
-            
-            # Handle URL-embedded authentication (Hive style)
-            if "x-api-key=" in server_url:
-                from urllib.parse import urlparse, parse_qs
-                parsed = urlparse(server_url)
-                query_params = parse_qs(parsed.query)
-                if "x-api-key" in query_params:
-                    api_key = query_params["x-api-key"][0]
-                    headers["x-api-key"] = api_key
-                    # Remove auth from URL for clean SSE connection
-                    sse_url = f"{parsed.scheme}://{parsed.netloc}{parsed.path}"
-                    if not sse_url.endswith('/sse'):
-                        sse_url += '/sse'
-            else:
-                # Handle header-based authentication (Atlassian style)
-                if auth_headers and len(auth_headers) > 0:
-                    headers.update(auth_headers)
-                # Ensure URL ends with /sse
-                if not sse_url.endswith('/sse'):
-                    sse_url += '/sse'
-            
-            # Test connection using official MCP client
-            async with sse_client(sse_url, headers=headers) as (transport_read, transport_write):
-                async with ClientSession(transport_read, transport_write) as session:
-                    await session.initialize()
-                    tools_response = await asyncio.wait_for(session.list_tools(), timeout=15.0)
-                    tools = tools_response.tools
-                    
-                    end_time = time.time()
-                    response_time = int((end_time - start_time) * 1000)
-                    
-                    return {
-                        "success": True,
-                        "message": "Connection successful",
-                        "tool_count": len(tools),
-                        "response_time_ms": response_time,
-                        "tools": [tool.name for tool in tools[:10]]  # First 10 tools
-                    }
-                
+            sse_url, headers = FastMCPService._resolve_endpoint(server_url, auth_headers)
+            
+            # Test connection using official MCP client (a warm pooled session is reused
+            # and a new one stays open for the tool calls that typically follow); one
+            # deadline covers connect/initialize on a cold pool plus list_tools
+            async with asyncio.timeout(CONNECTION_TEST_TIMEOUT_SECONDS):
+                async with mcp_session_pool.session(sse_url, headers) as session:
+                    tools_response = await session.list_tools()
+            tools = tools_response.tools
+            
+            end_time = time.perf_counter()
+            response_time = int((end_time - start_time) * 1000)
+            
+            test_result = {
+                "success": True,
+                "message": "Connection successful",
+                "tool_count": len(tools),
+                "response_time_ms": response_time,
+                "tools": [tool.name for tool in tools[:10]]  # First 10 tools
+            }
+            
+            # Only successes are cached so a fixed server/credential is re-probed immediately
+            _connection_test_cache[cache_key] = (
+                time.monotonic() + CONNECTION_TEST_CACHE_TTL_SECONDS,
+                test_result
+            )
+            return dict(test_result)
+            
         except asyncio.TimeoutError:
             return {
                 "success": False,
-                "message": "Connection timed out after 15 seconds",
+                "message": f"Connection timed out after {CONNECTION_TEST_TIMEOUT_SECONDS:.0f} seconds",
                 "tool_count": 0,
-                "response_time_ms": 15000
+                "response_time_ms": int(CONNECTION_TEST_TIMEOUT_SECONDS * 1000)
             }
         except Exception as e:
-            end_time = time.time()
+            end_time = time.perf_counter()
             response_time = int((end_time - start_time) * 1000)
             
             return {
@@ -184,7 +694,8 @@ class FastMCPService:
     @staticmethod
     async def discover_and_cache_tools(
         db: AsyncSession,
-        source_id: uuid.UUID
+        source_id: uuid.UUID,
+        auth_config: Optional[Dict[str, Any]] = None
     ) -> Tuple[bool, str, int]:
         """
         Discover tools from MCP server and cache them in database
@@ -192,13 +703,15 @@ class FastMCPService:
         Args:
             db: Database session
             source_id: Source ID to cache tools for
+            auth_config: Pre-fetched {server_url, auth_headers} (looked up if omitted)
             
         Returns:
             Tuple of (success, message, tool_count)
         """
         try:
             # Get source authentication configuration
-            auth_config = await SimplifiedCredentialManager.get_source_auth(db, source_id)
+            if auth_config is None:
+                auth_config = await SimplifiedCredentialManager.get_source_auth(db, source_id)
             if not auth_config:
                 return False, "Source authentication not found", 0
             
@@ -217,77 +730,53 @@ class FastMCPService:
             await db.commit()
             
             # Check if this is a local:// URL scheme that should route to local agents
-            if server_url.startswith(("local://", "stdio://", "agent://")):
+            if server_url.startswith(LOCAL_URL_SCHEMES):
                 return await FastMCPService._discover_tools_from_local_agent(
                     db, source_id, server_url
                 )
             
-            # Use the same authentication method as tool calls (official MCP client)
-            # This ensures consistency and works with servers that need specific header formats
-            headers = {}
-            sse_url = server_url
-            
-            # Handle URL-embedded authentication (Hive style)
-            if "x-api-key=" in server_url:
-                from urllib.parse import urlparse, parse_qs
-                parsed = urlparse(server_url)
-                query_params = parse_qs(parsed.query)
-                if "x-api-key" in query_params:
-                    api_key = query_params["x-api-key"][0]
-                    headers["x-api-key"] = api_key
-                    # Remove auth from URL for clean SSE connection
-                    sse_url = f"{parsed.scheme}://{parsed.netloc}{parsed.path}"
-                    if not sse_url.endswith('/sse'):
-                        sse_url += '/sse'
-            else:
-                # Handle header-based authentication (Atlassian style)
-                if auth_headers and len(auth_headers) > 0:
-                    headers.update(auth_headers)
-                # Ensure URL ends with /sse
-                if not sse_url.endswith('/sse'):
-                    sse_url += '/sse'
-            
-            # Discover tools using official MCP client (same as tool calls)
-            async with sse_client(sse_url, headers=headers) as (transport_read, transport_write):
-                async with ClientSession(transport_read, transport_write) as session:
-                    await session.initialize()
-                    tools_response = await asyncio.wait_for(session.list_tools(), timeout=30.0)
-                    tools = tools_response.tools
-            
-            # Clear existing cached tools for this source
-            await db.execute(
-                SourceTool.__table__.delete().where(SourceTool.source_id == source_id)
-            )
+            # Use the same authentication method as tool calls and discovery
+            sse_url, headers = FastMCPService._resolve_endpoint(server_url, auth_headers)
             
-            # Cache new tools
-            for tool in tools:
-                # Handle various schema formats
-                tool_schema = {}
-                if hasattr(tool, 'inputSchema'):
-                    # Some tools might have inputSchema = None
-                    tool_schema = tool.inputSchema if tool.inputSchema is not None else {}
-                
-                source_tool = SourceTool(
-                    source_id=source_id,
-                    tool_name=tool.name,
-                    tool_description=tool.description,
-                    tool_schema=tool_schema,
-                    last_refreshed_at=datetime.now(timezone.utc),
-                    is_active=True
-                )
-                db.add(source_tool)
+            # Discover tools using official MCP client (same pooled sessions as tool calls);
+            # the deadline also covers connect/initialize on a cold pool
+            async with asyncio.timeout(TOOL_DISCOVERY_TIMEOUT_SECONDS):
+                async with mcp_session_pool.session(sse_url, headers) as session:
+                    tools_response = await session.list_tools()
+            tools = tools_response.tools
             
-            # Update source status to indicate successful caching
-            await db.execute(
-                update(Source)
-                .where(Source.source_id == source_id)
-                .values(
-                    tools_cache_status="cached",
-                    tools_last_cached_at=datetime.now(timezone.utc),
-                    tools_cache_error=None
-                )
-            )
-            await db.commit()
+            # A migration that alters source_tools invalidates asyncpg's prepared
+            # statements on pooled connections; the driver drops them on the first
+            # failure, so the write is retried once in a fresh transaction
+            for write_attempt in range(2):
+                try:
+                    await FastMCPService.replace_cached_tools(
+                        db,
+                        source_id,
+                        # Some tools might have inputSchema = None
+                        ((tool.name, tool.description, getattr(tool, "inputSchema", None)) for tool in tools)
+                    )
+                    
+                    # Update source status to indicate successful caching
+                    await db.execute(
+                        update(Source)
+                        .where(Source.source_id == source_id)
+                        .values(
+                            tools_cache_status="cached",
+                            tools_last_cached_at=datetime.now(timezone.utc),
+                            tools_cache_error=None
+                        )
+                    )
+                    await db.commit()
+                    break
+                except DBAPIError as e:
+                    await db.rollback()
+                    if write_attempt or not _is_invalid_cached_statement(e):
+                        raise
+                    logger.warning(
+                        "Retrying tool cache write after cached statements were invalidated",
+                        source_id=source_id
+                    )
             
             logger.info(
                 "Tools discovered and cached successfully",
@@ -298,7 +787,7 @@ class FastMCPService:
             return True, f"Successfully cached {len(tools)} tools", len(tools)
             
         except asyncio.TimeoutError:
-            error_msg = "Tool discovery timed out after 30 seconds"
+            error_msg = f"Tool discovery timed out after {TOOL_DISCOVERY_TIMEOUT_SECONDS:.0f} seconds"
             await FastMCPService._update_cache_error(db, source_id, error_msg)
             return False, error_msg, 0
             
@@ -307,6 +796,100 @@ class FastMCPService:
             await FastMCPService._update_cache_error(db, source_id, error_msg)
             return False, error_msg, 0
     
+    @staticmethod
+    async def replace_cached_tools(
+        db: AsyncSession,
+        source_id: uuid.UUID,
+        tools: Iterable[Tuple[str, Optional[str], Optional[Dict[str, Any]]]]
+    ) -> int:
+        """
+        Replace a source's cached tools with one upsert and one delete (no commit)
+        
+        Rows are upserted on (source_id, tool_name) so unchanged tools keep their
+        rows; tools the server no longer exposes are deleted.
+        
+        Args:
+            db: Database session
+            source_id: Source the tools belong to
+            tools: (name, description, input_schema) per discovered tool
+            
+        Returns:
+            Number of tools cached (duplicate names collapse to the last one)
+        """
+        _source_tool_rows_cache.pop(source_id, None)
+        
+        refreshed_at = datetime.now(timezone.utc)
+        tool_rows = {
+            name: {
+                "source_id": source_id,
+                "tool_name": name,
+                "tool_description": description,
+                "tool_schema": schema or {},
+                "last_refreshed_at": refreshed_at,
+                "is_active": True
+            }
+            for name, description, schema in tools
+        }
+        
+        if tool_rows:
+            upsert = pg_insert(SourceTool).values(list(tool_rows.values()))
+            await db.execute(
+                upsert.on_conflict_do_update(
+                    index_elements=[SourceTool.source_id, SourceTool.tool_name],
+                    set_={
+                        "tool_description": upsert.excluded.tool_description,
+                        "tool_schema": upsert.excluded.tool_schema,
+                        "last_refreshed_at": upsert.excluded.last_refreshed_at,
+                        "is_active": True,
+                        "updated_at": func.now()
+                    }
+                )
+            )
+        
+        await db.execute(
+            delete(SourceTool).where(
+                SourceTool.source_id == source_id,
+                SourceTool.tool_name.notin_(list(tool_rows))
+            )
+        )
+        
+        return len(tool_rows)
+    
+    @staticmethod
+    async def discover_and_cache_tools_many(
+        source_ids: List[uuid.UUID],
+        concurrency: Optional[int] = None
+    ) -> List[Tuple[uuid.UUID, bool, str, int]]:
+        """
+        Discover and cache tools for several sources concurrently
+        
+        Auth for all sources is fetched in one query up front. Each source then
+        runs in its own database session (an AsyncSession cannot be shared
+        between concurrent tasks); a semaphore caps the number of simultaneous
+        SSE sessions.
+        
+        Args:
+            source_ids: Source IDs to cache tools for
+            concurrency: Maximum concurrent discoveries (defaults to MCP_DISCOVER_CONCURRENCY)
+            
+        Returns:
+            List of (source_id, success, message, tool_count) in input order
+        """
+        async with AsyncSessionLocal() as db:
+            auth_by_id = await SimplifiedCredentialManager.get_sources_auth(db, source_ids)
+        
+        semaphore = asyncio.Semaphore(concurrency or settings.mcp_discover_concurrency)
+        
+        async def _discover_one(source_id: uuid.UUID) -> Tuple[uuid.UUID, bool, str, int]:
+            async with semaphore:
+                async with AsyncSessionLocal() as db:
+                    success, message, tool_count = await FastMCPService.discover_and_cache_tools(
+                        db, source_id, auth_by_id.get(source_id)
+                    )
+                    return source_id, success, message, tool_count
+        
+        return list(await asyncio.gather(*(_discover_one(source_id) for source_id in source_ids)))
+    
     @staticmethod
     async def _discover_tools_from_local_agent(
         db: AsyncSession,
@@ -329,13 +912,11 @@ class FastMCPService:
         """
         try:
             # Check if we already have cached tools for this source
-            from sqlalchemy import select, func
-            result = await db.execute(
-                select(func.count(SourceTool.tool_name))
-                .where(SourceTool.source_id == source_id)
-                .where(SourceTool.is_active == True)
+            tool_count = await db.scalar(
+                select(func.count())
+                .select_from(SourceTool)
+                .where(SourceTool.source_id == source_id, SourceTool.is_active.is_(True))
             )
-            tool_count = result.scalar_one()
             
             if tool_count > 0:
                 logger.info(
@@ -411,12 +992,13 @@ class FastMCPService:
         """
         
         # Check if this is a local:// URL scheme that should route to local agents
-        if server_url.startswith(("local://", "stdio://", "agent://")):
+        if server_url.startswith(LOCAL_URL_SCHEMES):
             return await FastMCPService._call_tool_via_local_agent(
                 server_url, tool_name, arguments
             )
         
-        # Handle remote MCP servers with retry logic
+        # Handle remote MCP servers with retry logic (endpoint resolved once for all attempts)
+        sse_url, headers = FastMCPService._resolve_endpoint(server_url, auth_headers)
         last_error = None
         
         for attempt in range(max_retries + 1):
@@ -438,98 +1020,51 @@ class FastMCPService:
                         max_retries=max_retries
                     )
                 
-                # Prepare headers for official MCP client (extract auth from URL if needed)
-                headers = {}
-                sse_url = server_url
+                # Back off between retries; jitter keeps concurrent callers of a shared
+                # upstream from retrying in lockstep
+                if attempt > 0:
+                    await asyncio.sleep(_retry_delay(attempt))
                 
-                # Handle URL-embedded authentication (Hive style)
-                if "x-api-key=" in server_url:
-                    from urllib.parse import urlparse, parse_qs
-                    parsed = urlparse(server_url)
-                    query_params = parse_qs(parsed.query)
-                    if "x-api-key" in query_params:
-                        api_key = query_params["x-api-key"][0]
-                        headers["x-api-key"] = api_key
-                        # Remove auth from URL for clean SSE connection
-                        sse_url = f"{parsed.scheme}://{parsed.netloc}{parsed.path}"
-                        if not sse_url.endswith('/sse'):
-                            sse_url += '/sse'
-                    logger.info(f"Extracted Hive auth from URL: x-api-key present, clean URL: {sse_url}")
-                else:
-                    # Handle header-based authentication (Atlassian style)
-                    if auth_headers and len(auth_headers) > 0:
-                        headers.update(auth_headers)
-                    # Ensure URL ends with /sse
-                    if not sse_url.endswith('/sse'):
-                        sse_url += '/sse'
+                # One deadline covers connect/initialize (on a cold pool) + the call so a
+                # slow handshake cannot stretch a single attempt past the timeout
+                async with asyncio.timeout(settings.mcp_call_timeout):
+                    async with mcp_session_pool.session(sse_url, headers) as session:
+                        # No list_tools probe: the server's tool list is already cached in source_tools
+                        result = await session.call_tool(tool_name, arguments)
                 
-                # Add small delay between retries to avoid overwhelming server
-                if attempt > 0:
-                    await asyncio.sleep(min(attempt * 0.5, 2.0))  # 0.5s, 1s, 2s max
+                logger.info(
+                    "Official MCP client tool call succeeded",
+                    tool_name=tool_name,
+                    attempt=attempt,
+                    result_type=type(result).__name__
+                )
                 
-                async with sse_client(sse_url, headers=headers) as (transport_read, transport_write):
-                    async with ClientSession(transport_read, transport_write) as session:
-                        # Initialize the session
-                        await session.initialize()
-                        
-                        # List available tools for debugging (only on first attempt)
-                        if attempt == 0:
-                            try:
-                                tools_response = await session.list_tools()
-                                tool_names = [tool.name for tool in tools_response.tools]
-                                logger.info(
-                                    "Available tools on server (official MCP client)",
-                                    tool_count=len(tool_names),
-                                    has_search_emails='search_emails' in tool_names,
-                                    has_jira_search='jira_search' in tool_names,
-                                    first_few_tools=tool_names[:5]
-                                )
-                            except Exception as e:
-                                logger.warning("Failed to list tools with official client", error=str(e))
-                        
-                        # Call the tool
-                        result = await asyncio.wait_for(
-                            session.call_tool(tool_name, arguments), 
-                            timeout=60.0
-                        )
-                        
-                        logger.info(
-                            "Official MCP client tool call succeeded",
-                            tool_name=tool_name,
-                            attempt=attempt,
-                            result_type=type(result).__name__
-                        )
-                        
-                        # Extract result content
-                        tool_result = ""
-                        if hasattr(result, 'content') and result.content:
-                            for content_item in result.content:
-                                if hasattr(content_item, 'text'):
-                                    tool_result += content_item.text
-                                else:
-                                    tool_result += str(content_item)
-                        else:
-                            tool_result = str(result)
-                        
-                        return {
-                            "success": True,
-                            "result": tool_result,
-                            "tool_name": tool_name,
-                            "arguments": arguments
-                        }
-                    
+                # Extract result content (join once instead of repeated concatenation)
+                content = getattr(result, "content", None)
+                if content:
+                    tool_result = "".join(map(_content_text, content))
+                else:
+                    tool_result = str(result)
+                
+                return {
+                    "success": True,
+                    "result": tool_result,
+                    "tool_name": tool_name,
+                    "arguments": arguments
+                }
+            
             except asyncio.TimeoutError as e:
                 last_error = e
                 if attempt == max_retries:
                     logger.error(
                         "Official MCP tool call timed out after all retries",
                         tool_name=tool_name,
-                        timeout=60.0,
+                        timeout=settings.mcp_call_timeout,
                         attempts=attempt + 1
                     )
                     return {
                         "success": False,
-                        "error": f"Tool call timed out after 60 seconds (tried {attempt + 1} times)",
+                        "error": f"Tool call timed out after {settings.mcp_call_timeout:.0f} seconds (tried {attempt + 1} times)",
                         "tool_name": tool_name,
                         "arguments": arguments
                     }
@@ -542,6 +1077,20 @@ class FastMCPService:
                     
             except Exception as e:
                 last_error = e
+                if not _is_transient_error(e):
+                    logger.error(
+                        "Official MCP tool call failed (not retryable)",
+                        tool_name=tool_name,
+                        error=str(e),
+                        exception_type=type(e).__name__,
+                        attempts=attempt + 1
+                    )
+                    return {
+                        "success": False,
+                        "error": f"Tool call failed: {str(e)}",
+                        "tool_name": tool_name,
+                        "arguments": arguments
+                    }
                 if attempt == max_retries:
                     logger.error(
                         "Official MCP tool call failed after all retries",
@@ -637,14 +1186,29 @@ class FastMCPToolManager:
     
     def __init__(self):
         self.server_configs: List[MCPServerConfig] = []
+        self.server_configs_by_id: Dict[uuid.UUID, MCPServerConfig] = {}
         self.tools: List[BaseTool] = []
         self.sources: List[Source] = []
         
+        # Bumped whenever self.tools is replaced; keys memoized tool views
+        self._tools_version = 0
+        self._search_tools_cache: Optional[Tuple[int, List[BaseTool]]] = None
+        self._tools_snapshot: Optional[Tuple[int, Tuple[BaseTool, ...]]] = None
+        self._server_names_snapshot: Optional[Tuple[int, Tuple[str, ...]]] = None
+        self._source_instruction_rows: List[Tuple[uuid.UUID, str, Optional[str]]] = []
+        self._bot_instructions: Optional[Tuple[Tuple[uuid.UUID, ...], Dict[uuid.UUID, str]]] = None
+        # (bot selection, instructions map) for the current instruction rows; cleared
+        # whenever the rows are replaced
+        self._instructions_cache: Optional[Tuple[Tuple[uuid.UUID, ...], Dict[str, str]]] = None
+        # (server configs + cache versions of the last full load, expiry) for no-op reloads
+        self._load_fingerprint: Optional[Tuple[Tuple[Tuple[MCPServerConfig, Any], ...], float]] = None
+        
     async def load_tools_for_user(
         self,
         db: AsyncSession,
         user_id: uuid.UUID,
-        bot_source_ids: Optional[List[uuid.UUID]] = None
+        bot_source_ids: Optional[List[uuid.UUID]] = None,
+        selected_bot_ids: Optional[List[uuid.UUID]] = None
     ) -> int:
         """
         Load tools from database cache for user and optional bot sources
@@ -653,48 +1217,39 @@ class FastMCPToolManager:
             db: Database session
             user_id: User ID
             bot_source_ids: Optional bot source IDs to include
+            selected_bot_ids: Optional selected bots whose source instructions are
+                prefetched with the sources (see get_source_instructions)
             
         Returns:
             Number of tools loaded
         """
-        # Get user sources
-        user_sources_query = select(Source).where(
-            Source.owner_user_id == user_id,
+        # User sources plus bot sources (if specified and non-empty) in one round trip
+        ownership = Source.owner_user_id == user_id
+        if bot_source_ids:
+            ownership = or_(ownership, uuid_in(Source.source_id, bot_source_ids))
+        
+        sources_query = self._select_sources(selected_bot_ids).where(
+            ownership,
             Source.is_active.is_(True),
             Source.tools_cache_status == "cached"
         )
         
-        # Get bot sources if specified and non-empty
-        bot_sources_query = None
-        if bot_source_ids and len(bot_source_ids) > 0:
-            bot_sources_query = select(Source).where(
-                Source.source_id.in_(bot_source_ids),
-                Source.is_active.is_(True),
-                Source.tools_cache_status == "cached"
-            )
-        
-        # Execute queries
-        user_sources_result = await db.execute(user_sources_query)
-        user_sources = user_sources_result.scalars().all()
-        
-        bot_sources = []
-        if bot_sources_query is not None:
-            bot_sources_result = await db.execute(bot_sources_query)
-            bot_sources = bot_sources_result.scalars().all()
-        
-        all_sources = list(user_sources) + list(bot_sources)
+        all_sources, bot_instructions = self._split_source_rows(
+            (await db.execute(sources_query)).all(), selected_bot_ids
+        )
         
         if not all_sources:
             logger.warning("No cached sources found for tool loading")
             return 0
         
-        return await self._load_tools_from_sources(db, all_sources)
+        return await self._load_tools_from_sources(db, all_sources, bot_instructions)
     
     async def load_tools_for_specific_sources(
         self,
         db: AsyncSession,
         user_id: uuid.UUID,
-        source_ids: List[uuid.UUID]
+        source_ids: List[uuid.UUID],
+        selected_bot_ids: Optional[List[uuid.UUID]] = None
     ) -> int:
         """
         Load tools from database cache for specific source IDs only
@@ -703,6 +1258,8 @@ class FastMCPToolManager:
             db: Database session
             user_id: User ID (for access control)
             source_ids: Specific source IDs to load tools from
+            selected_bot_ids: Optional selected bots whose source instructions are
+                prefetched with the sources (see get_source_instructions)
             
         Returns:
             Number of tools loaded
@@ -712,8 +1269,8 @@ class FastMCPToolManager:
             return 0
         
         # Get sources by IDs with access control - user must have access to these sources
-        sources_query = select(Source).where(
-            Source.source_id.in_(source_ids),
+        sources_query = self._select_sources(selected_bot_ids).where(
+            uuid_in(Source.source_id, source_ids),
             Source.is_active.is_(True),
             Source.tools_cache_status == "cached"
         ).where(
@@ -724,8 +1281,9 @@ class FastMCPToolManager:
             # TODO: Add proper sharing check via SourceShare table if needed
         )
         
-        sources_result = await db.execute(sources_query)
-        filtered_sources = sources_result.scalars().all()
+        filtered_sources, bot_instructions = self._split_source_rows(
+            (await db.execute(sources_query)).all(), selected_bot_ids
+        )
         
         logger.info(
             "Filtered sources for specific source loading",
@@ -743,12 +1301,49 @@ class FastMCPToolManager:
             )
             return 0
         
-        return await self._load_tools_from_sources(db, filtered_sources)
+        return await self._load_tools_from_sources(db, filtered_sources, bot_instructions)
+    
+    @staticmethod
+    def _select_sources(selected_bot_ids: Optional[List[uuid.UUID]]):
+        """
+        Select Source rows, plus each source's custom instructions from the selected
+        bots (if any) as a correlated subquery so they arrive in the same round trip
+        """
+        if not selected_bot_ids:
+            return select(Source)
+        
+        bot_instructions = (
+            select(BotSourceAssociation.custom_instructions)
+            .where(
+                BotSourceAssociation.source_id == Source.source_id,
+                uuid_in(BotSourceAssociation.bot_id, selected_bot_ids),  # CRITICAL: Only from selected bots
+                BotSourceAssociation.custom_instructions.isnot(None),
+                BotSourceAssociation.custom_instructions != ""
+            )
+            .limit(1)
+            .correlate(Source)
+            .scalar_subquery()
+        )
+        return select(Source, bot_instructions)
+    
+    @staticmethod
+    def _split_source_rows(
+        rows: List[Row],
+        selected_bot_ids: Optional[List[uuid.UUID]]
+    ) -> Tuple[List[Source], Optional[Tuple[Tuple[uuid.UUID, ...], Dict[uuid.UUID, str]]]]:
+        """Split rows from _select_sources into sources and prefetched bot instructions"""
+        sources = [row[0] for row in rows]
+        if not selected_bot_ids:
+            return sources, None
+        
+        instructions = {row[0].source_id: row[1] for row in rows if row[1]}
+        return sources, (tuple(selected_bot_ids), instructions)
     
     async def _load_tools_from_sources(
         self,
         db: AsyncSession,
-        sources: List[Source]
+        sources: List[Source],
+        bot_instructions: Optional[Tuple[Tuple[uuid.UUID, ...], Dict[uuid.UUID, str]]] = None
     ) -> int:
         """
         Common method to load tools from a list of source objects
@@ -756,6 +1351,7 @@ class FastMCPToolManager:
         Args:
             db: Database session
             sources: List of Source objects to load tools from
+            bot_instructions: Prefetched (selected_bot_ids, {source_id: instructions})
             
         Returns:
             Number of tools loaded
@@ -764,19 +1360,31 @@ class FastMCPToolManager:
             logger.warning("No sources provided for tool loading")
             return 0
         
-        # Store sources for instruction retrieval
+        # Store sources for instruction retrieval; plain (id, name, instructions) tuples are
+        # captured now so later reads never touch (possibly expired) ORM attributes
         self.sources = sources
+        self._source_instruction_rows = [
+            (source.source_id, source.name, source.instructions) for source in sources
+        ]
+        self._bot_instructions = bot_instructions
+        # Instruction inputs were just re-read, even if the tools turn out unchanged below
+        self._instructions_cache = None
         
         # Build server configs with proper authentication extraction
         self.server_configs = []
         
+        # Use the same authentication extraction as tool discovery for consistency
+        # (one query for all sources)
+        auth_by_id = await SimplifiedCredentialManager.get_sources_auth(
+            db, [source.source_id for source in sources]
+        )
+        
         for source in sources:
             # Extract source attributes early to avoid greenlet issues
             source_id = source.source_id
             source_name = source.name
             
-            # Use the same authentication extraction as tool discovery for consistency
-            auth_config = await SimplifiedCredentialManager.get_source_auth(db, source_id)
+            auth_config = auth_by_id.get(source_id)
             if auth_config:
                 server_url = auth_config["server_url"]
                 auth_headers = auth_config["auth_headers"]
@@ -784,7 +1392,7 @@ class FastMCPToolManager:
                 # Fallback to direct source data if credential manager fails
                 server_url = source.server_url
                 auth_headers = source.auth_headers or {}
-                logger.warning(f"Could not get auth config for source {source_id}, using fallback")
+                logger.warning("Could not get auth config for source, using fallback", source_id=str(source_id))
             
             config = MCPServerConfig(
                 source_id=source_id,
@@ -794,138 +1402,234 @@ class FastMCPToolManager:
             )
             self.server_configs.append(config)
         
-        # Get cached tools for all sources
-        source_ids = [config.source_id for config in self.server_configs]
+        config_by_id = {config.source_id: config for config in self.server_configs}
+        self.server_configs_by_id = config_by_id
         
-        # Only query for cached tools if we have source IDs
-        cached_tools = []
-        if source_ids:
-            cached_tools_query = select(SourceTool).where(
-                SourceTool.source_id.in_(source_ids),
-                SourceTool.is_active.is_(True)
+        # Tools depend only on the server configs (name, URL, credentials) and the cached
+        # tool rows, so reloading identical sources can keep the tools already built
+        fingerprint = tuple(
+            (config, source.tools_last_cached_at)
+            for config, source in zip(self.server_configs, sources)
+        )
+        now = time.monotonic()
+        if (
+            self.tools
+            and self._load_fingerprint
+            and self._load_fingerprint[0] == fingerprint
+            and self._load_fingerprint[1] > now
+        ):
+            logger.info(
+                "FastMCP tools unchanged since last load",
+                total_tools=len(self.tools),
+                sources_used=len(sources)
             )
-            
-            cached_tools_result = await db.execute(cached_tools_query)
-            cached_tools = cached_tools_result.scalars().all()
+            return len(self.tools)
+        self._load_fingerprint = None
         
-        # Create LangChain tools from cached data
+        cached_tools_found = 0
         self.tools = []
         
-        for cached_tool in cached_tools:
-            # Find server config for this tool
-            server_config = next(
-                (config for config in self.server_configs if config.source_id == cached_tool.source_id),
-                None
+        # Reuse tool rows (and the tools built from them, if built for the same server
+        # config) from earlier loads when the source has not been re-cached since
+        stale_versions = {}
+        for source in sources:
+            source_id = source.source_id
+            version = source.tools_last_cached_at
+            entry = _source_tool_rows_cache.get(source_id)
+            if entry and entry[0] == version and entry[1] > now:
+                config = config_by_id[source_id]
+                built = entry[3]
+                if built is None or built[0] != config:
+                    built = (config, self._create_langchain_tools(entry[2], config_by_id))
+                _store_source_tool_rows(source_id, (entry[0], entry[1], entry[2], built))
+                cached_tools_found += len(entry[2])
+                self.tools.extend(built[1])
+            else:
+                if entry:
+                    del _source_tool_rows_cache[source_id]
+                stale_versions[source_id] = version
+        
+        # Fetch the rest, streaming rows in partitions so large tool sets are never
+        # fully materialized at once
+        if stale_versions:
+            fetched_rows: Dict[uuid.UUID, List[Row]] = {source_id: [] for source_id in stale_versions}
+            fetched_tools: Dict[uuid.UUID, List[BaseTool]] = {source_id: [] for source_id in stale_versions}
+            cached_tools_result = await db.stream(
+                _CACHED_TOOL_ROWS_STMT, {"source_ids": list(stale_versions)}
             )
+            async for partition in cached_tools_result.partitions():
+                cached_tools_found += len(partition)
+                for row in partition:
+                    fetched_rows[row.source_id].append(row)
+                partition_tools = self._create_langchain_tools(partition, config_by_id)
+                for tool in partition_tools:
+                    fetched_tools[tool.metadata['source_id']].append(tool)
+                self.tools.extend(partition_tools)
             
-            if not server_config:
-                continue
-            
-            # Create LangChain tool that uses FastMCP
-            langchain_tool = self._create_langchain_tool(cached_tool, server_config)
-            self.tools.append(langchain_tool)
+            expires_at = time.monotonic() + SOURCE_TOOL_ROWS_CACHE_TTL_SECONDS
+            for source_id, rows in fetched_rows.items():
+                _store_source_tool_rows(source_id, (
+                    stale_versions[source_id],
+                    expires_at,
+                    rows,
+                    (config_by_id[source_id], fetched_tools[source_id])
+                ))
+        
+        self._tools_version += 1
+        self._load_fingerprint = (fingerprint, now + SOURCE_TOOL_ROWS_CACHE_TTL_SECONDS)
         
         logger.info(
             "FastMCP tools loaded from sources",
             total_tools=len(self.tools),
-            cached_tools_found=len(cached_tools),
-            tools_skipped=len(cached_tools) - len(self.tools),
+            cached_tools_found=cached_tools_found,
+            tools_skipped=cached_tools_found - len(self.tools),
             source_count=len(self.server_configs),
             sources_used=len(sources)
         )
         
         return len(self.tools)
     
-    def _create_langchain_tool(self, cached_tool: SourceTool, server_config: MCPServerConfig) -> BaseTool:
-        """Create a LangChain tool that uses FastMCP for execution"""
-        from pydantic import BaseModel, create_model, Field
-        from typing import Optional, Any
-        
-        # Extract tool metadata
-        original_tool_name = cached_tool.tool_name
-        tool_description = cached_tool.tool_description or f"Tool {original_tool_name} from {server_config.name}"
-        tool_schema = cached_tool.tool_schema or {}
-        
-        # Create namespaced tool name to avoid conflicts between sources
-        # Convert source name to safe identifier (replace spaces/special chars with underscores)
-        safe_source_name = "".join(c if c.isalnum() else "_" for c in server_config.name.lower())
-        safe_source_name = safe_source_name.strip("_")  # Remove leading/trailing underscores
-        
-        # Create namespaced tool name: source_toolname
-        namespaced_tool_name = f"{safe_source_name}_{original_tool_name}"
-        
-        # Update description to indicate source
-        enhanced_description = f"[{server_config.name}] {tool_description}"
+    def _create_langchain_tools(
+        self,
+        cached_tools: Iterable[Row],
+        config_by_id: Dict[uuid.UUID, MCPServerConfig]
+    ) -> List[BaseTool]:
+        """
+        Create LangChain tools for a batch of cached tool rows
         
-        # Get schema properties
+        Args:
+            cached_tools: Cached tool rows to convert
+            config_by_id: Server configs keyed by source ID
+            
+        Returns:
+            List of LangChain tools (rows without a server config are skipped)
+        """
+        return [
+            self._create_langchain_tool(cached_tool, server_config)
+            for cached_tool in cached_tools
+            if (server_config := config_by_id.get(cached_tool.source_id)) is not None
+        ]
+    
+    @staticmethod
+    def _build_args_schema(model_name: str, tool_schema: Dict[str, Any]) -> Type[BaseModel]:
+        """Create a Pydantic args model from an MCP JSON schema"""
         properties = tool_schema.get("properties", {})
         required_params = tool_schema.get("required", [])
         
-        # Create Pydantic model from MCP schema for LangChain
         pydantic_fields = {}
         
         for param_name, param_def in properties.items():
-            param_type = param_def.get("type", "string")
-            param_description = param_def.get("description", "")
-            param_default = param_def.get("default")
-            
             # Map JSON Schema types to Python types
-            if param_type == "string":
-                python_type = str
-            elif param_type == "integer":
-                python_type = int
-            elif param_type == "number":
-                python_type = float
-            elif param_type == "boolean":
-                python_type = bool
-            else:
-                python_type = Any
+            python_type = _JSON_SCHEMA_TYPES.get(param_def.get("type", "string"), Any)
+            param_description = param_def.get("description", "")
             
             # Make optional if not in required params
             if param_name not in required_params:
-                python_type = Optional[python_type]
-                if param_default is not None:
-                    pydantic_fields[param_name] = (python_type, Field(default=param_default, description=param_description))
-                else:
-                    pydantic_fields[param_name] = (python_type, Field(default=None, description=param_description))
+                pydantic_fields[param_name] = (
+                    Optional[python_type],
+                    Field(default=param_def.get("default"), description=param_description)
+                )
             else:
                 pydantic_fields[param_name] = (python_type, Field(description=param_description))
         
-        # Create dynamic Pydantic model
-        if pydantic_fields:
-            args_schema = create_model(f"{namespaced_tool_name}Args", **pydantic_fields)
-        else:
-            # Handle tools with missing/empty schemas - assume they take no parameters
-            args_schema = create_model(f"{namespaced_tool_name}Args")  # Empty model = no parameters
-            
-            if tool_schema is None:
-                logger.info(f"🔧 Tool {namespaced_tool_name} has no schema (None) - creating no-parameter tool")
-            elif tool_schema == {}:
-                logger.info(f"🔧 Tool {namespaced_tool_name} has empty schema ({{}}) - creating no-parameter tool")
-            else:
-                logger.info(f"🔧 Tool {namespaced_tool_name} has schema with no properties - creating no-parameter tool")
-        
-        # Create dynamic tool function
-        async def tool_func(**kwargs) -> str:
-            """Dynamic tool function that calls FastMCP"""
-            logger.info(f"🔧 NAMESPACED TOOL CALL: {namespaced_tool_name} -> {original_tool_name} with {kwargs}")
-            
-            # Call the original tool name on the MCP server
-            result = await FastMCPService.call_tool(
-                server_url=server_config.server_url,
-                auth_headers=server_config.auth_headers,
-                tool_name=original_tool_name,  # Use original name for MCP server
-                arguments=kwargs
+        return create_model(model_name, **pydantic_fields)
+    
+    @staticmethod
+    async def _invoke_tool(
+        server_config: MCPServerConfig,
+        original_tool_name: str,
+        namespaced_tool_name: str,
+        cacheable: bool,
+        /,
+        **kwargs
+    ) -> str:
+        """
+        Execute a namespaced tool via FastMCP (bound per tool with functools.partial)
+        
+        Results of read-only (cacheable) tools are reused for identical calls
+        within a short TTL, and concurrent identical calls share one request.
+        The leading parameters are positional-only so tool arguments can use any name.
+        """
+        # Structured debug event: filtered by level before any formatting of kwargs
+        logger.debug(
+            "🔧 Namespaced tool call",
+            tool=namespaced_tool_name,
+            original_tool=original_tool_name,
+            arguments=kwargs
+        )
+        
+        # Call the original tool name on the MCP server
+        call = partial(
+            FastMCPService.call_tool,
+            server_url=server_config.server_url,
+            auth_headers=server_config.auth_headers,
+            tool_name=original_tool_name,  # Use original name for MCP server
+            arguments=kwargs
+        )
+        
+        if cacheable:
+            # Auth is part of the key: sources shared by URL may carry per-user credentials
+            cache_key = (
+                server_config.server_url,
+                server_config.auth_fingerprint,
+                original_tool_name,
+                orjson.dumps(kwargs, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS, default=str)
             )
-            
-            if result.get("success"):
-                return result["result"]
+            result = await tool_result_cache.get_or_call(cache_key, call)
+        else:
+            result = await call()
+        
+        if result.get("success"):
+            return result["result"]
+        else:
+            return f"Error: {result.get('error', 'Unknown error')}"
+    
+    def _create_langchain_tool(
+        self,
+        cached_tool: Row,
+        server_config: MCPServerConfig
+    ) -> BaseTool:
+        """Create a LangChain tool that uses FastMCP for execution"""
+        # Extract tool metadata
+        original_tool_name = cached_tool.tool_name
+        tool_schema = cached_tool.tool_schema or {}
+        
+        # Create namespaced tool name to avoid conflicts between sources: source_toolname
+        # (the safe source identifier is computed once per source config)
+        namespaced_tool_name = f"{server_config.safe_name}_{original_tool_name}"
+        
+        # Update description to indicate source (single concatenation with the per-source tag)
+        enhanced_description = server_config.description_prefix + (
+            cached_tool.tool_description or f"Tool {original_tool_name} from {server_config.name}"
+        )
+        
+        # Create (or reuse) the Pydantic args model for LangChain; tools with identical
+        # input schemas share one generated model for the life of the process
+        if not tool_schema.get("properties"):
+            # Missing/empty schema: no parameters, no need to digest or build anything
+            args_schema = _EMPTY_ARGS_SCHEMA
+        else:
+            schema_key = hashlib.blake2b(
+                orjson.dumps(tool_schema, option=orjson.OPT_SORT_KEYS), digest_size=16
+            ).digest()
+            args_schema = _ARGS_SCHEMA_CACHE.get(schema_key)
+            if args_schema is None:
+                args_schema = self._build_args_schema(f"{namespaced_tool_name}Args", tool_schema)
+                _ARGS_SCHEMA_CACHE[schema_key] = args_schema
+                if len(_ARGS_SCHEMA_CACHE) > ARGS_SCHEMA_CACHE_MAXSIZE:
+                    _ARGS_SCHEMA_CACHE.popitem(last=False)
             else:
-                return f"Error: {result.get('error', 'Unknown error')}"
+                _ARGS_SCHEMA_CACHE.move_to_end(schema_key)
         
-        # Use StructuredTool for proper schema handling
-        from langchain.tools import StructuredTool
+        # Name/description never change after construction, so classify once here
+        is_search_readonly = _is_search_readonly(namespaced_tool_name, enhanced_description)
         
+        # One shared coroutine function bound to this tool (no per-tool closure)
+        tool_func = partial(
+            self._invoke_tool, server_config, original_tool_name, namespaced_tool_name, is_search_readonly
+        )
+        
+        # Use StructuredTool for proper schema handling
         return StructuredTool(
             name=namespaced_tool_name,  # Use namespaced name for LangChain
             description=enhanced_description,  # Enhanced description with source info
@@ -936,81 +1640,88 @@ class FastMCPToolManager:
                 'source_id': server_config.source_id,
                 'source_name': server_config.name,
                 'server_url': server_config.server_url,
-                'original_tool_name': original_tool_name  # Store original name for reference
+                'original_tool_name': original_tool_name,  # Store original name for reference
+                'is_search_readonly': is_search_readonly
             }
         )
     
-    def get_tools(self) -> List[BaseTool]:
-        """Get loaded LangChain tools"""
-        return self.tools.copy()
+    def get_tools(self) -> Tuple[BaseTool, ...]:
+        """Get loaded LangChain tools (immutable snapshot, rebuilt only when tools change)"""
+        if self._tools_snapshot is None or self._tools_snapshot[0] != self._tools_version:
+            self._tools_snapshot = (self._tools_version, tuple(self.tools))
+        return self._tools_snapshot[1]
     
-    def get_server_names(self) -> List[str]:
-        """Get names of loaded servers"""
-        return [config.name for config in self.server_configs]
+    def get_server_names(self) -> Tuple[str, ...]:
+        """Get names of loaded servers (immutable snapshot, rebuilt only when tools change)"""
+        if self._server_names_snapshot is None or self._server_names_snapshot[0] != self._tools_version:
+            self._server_names_snapshot = (
+                self._tools_version,
+                tuple(config.name for config in self.server_configs)
+            )
+        return self._server_names_snapshot[1]
     
     def filter_search_tools(self) -> List[BaseTool]:
-        """Filter tools to search/read-only tools (excludes destructive operations)"""
-        search_keywords = [
-            'search', 'get', 'list', 'find', 'read', 'fetch', 'query', 'lookup',
-            'retrieve', 'browse', 'view', 'show', 'describe', 'info'
-        ]
-        
-        destructive_keywords = [
-            'delete', 'remove', 'create', 'update', 'modify', 'write', 'post',
-            'put', 'patch', 'edit', 'change', 'set', 'insert', 'add'
-        ]
+        """
+        Filter tools to search/read-only tools (excludes destructive operations)
         
-        search_tools = []
+        The result is memoized until the tool set changes; callers must not mutate it.
+        """
+        if self._search_tools_cache and self._search_tools_cache[0] == self._tools_version:
+            return self._search_tools_cache[1]
         
-        for tool in self.tools:
-            tool_name_lower = tool.name.lower()
-            tool_desc_lower = (tool.description or "").lower()
-            
-            # Check if it's a search tool
-            is_search = any(keyword in tool_name_lower or keyword in tool_desc_lower 
-                          for keyword in search_keywords)
-            
-            # Check if it's destructive
-            is_destructive = any(keyword in tool_name_lower or keyword in tool_desc_lower 
-                               for keyword in destructive_keywords)
-            
-            # Include if it's a search tool and not destructive
-            if is_search and not is_destructive:
-                search_tools.append(tool)
+        # Classification is precomputed when each tool is built
+        search_tools = [tool for tool in self.tools if tool.metadata.get('is_search_readonly')]
         
+        self._search_tools_cache = (self._tools_version, search_tools)
         return search_tools
     
     async def get_source_instructions(self, db: AsyncSession, selected_bot_ids: Optional[List[uuid.UUID]] = None) -> Dict[str, str]:
         """Get instructions for all loaded sources, including bot-specific instructions ONLY from selected bots"""
+        if not self._source_instruction_rows:
+            # Nothing loaded (or loading failed): no sources, no instructions
+            return {}
+        
+        # Memoized per bot selection for the loaded instruction rows (loading clears the
+        # memo); a copy is returned so callers can never mutate the cached map
+        cache_key = tuple(selected_bot_ids or ())
+        if self._instructions_cache is not None and self._instructions_cache[0] == cache_key:
+            return dict(self._instructions_cache[1])
+        
         instructions_map = {}
         
-        if hasattr(self, 'sources'):
-            for source in self.sources:
-                # Extract attributes early to avoid greenlet issues
-                source_name = source.name
-                source_instructions = source.instructions
-                source_id = source.source_id
-                
-                # Only check for bot-specific instructions if bots are selected AND source is used by selected bots
-                bot_instructions = None
-                if selected_bot_ids:
-                    bot_instructions_query = select(BotSourceAssociation.custom_instructions).where(
-                        BotSourceAssociation.source_id == source_id,
-                        BotSourceAssociation.bot_id.in_(selected_bot_ids),  # CRITICAL: Only from selected bots
-                        BotSourceAssociation.custom_instructions.isnot(None),
-                        BotSourceAssociation.custom_instructions != ""
-                    )
-                    
-                    bot_instructions_result = await db.execute(bot_instructions_query)
-                    bot_instructions = bot_instructions_result.scalar()
-                
-                # Use bot-specific instructions ONLY if from selected bots, otherwise fall back to source instructions
-                if bot_instructions:
-                    instructions_map[source_name] = bot_instructions
-                    logger.info(f"📋 Using BOT-SPECIFIC instructions for source: {source_name} -> {bot_instructions}")
-                elif source_instructions:
-                    instructions_map[source_name] = source_instructions
-                    logger.info(f"📋 Using general instructions for source: {source_name} -> {source_instructions}")
-        
-        logger.info(f"📋 Loaded instructions for {len(instructions_map)} sources (with {len(selected_bot_ids or [])} selected bots)")
-        return instructions_map 
\ No newline at end of file
+        # Bot-specific instructions for all loaded sources, ONLY from selected bots: reuse
+        # the ones prefetched with the sources, else fetch them in one query
+        bot_instructions_by_source: Dict[uuid.UUID, str] = {}
+        if (
+            selected_bot_ids
+            and self._bot_instructions is not None
+            and self._bot_instructions[0] == tuple(selected_bot_ids)
+        ):
+            bot_instructions_by_source = self._bot_instructions[1]
+        elif selected_bot_ids:
+            bot_instructions_result = await db.execute(
+                _BOT_INSTRUCTIONS_STMT,
+                {
+                    "source_ids": [row[0] for row in self._source_instruction_rows],
+                    "bot_ids": list(dict.fromkeys(selected_bot_ids))
+                }
+            )
+            for source_id, custom_instructions in bot_instructions_result.all():
+                # First match wins when several selected bots customize the same source
+                bot_instructions_by_source.setdefault(source_id, custom_instructions)
+        
+        for source_id, source_name, source_instructions in self._source_instruction_rows:
+            # Use bot-specific instructions ONLY if from selected bots, otherwise fall back to source instructions
+            bot_instructions = bot_instructions_by_source.get(source_id)
+            if bot_instructions:
+                instructions_map[source_name] = bot_instructions
+            elif source_instructions:
+                instructions_map[source_name] = source_instructions
+        
+        logger.info(
+            "📋 Loaded source instructions",
+            source_count=len(instructions_map),
+            selected_bot_count=len(selected_bot_ids or [])
+        )
+        self._instructions_cache = (cache_key, instructions_map)
+        return dict(instructions_map) 
\ No newline at end of file
@@ -7,12 +7,60 @@ This replaces the rigid citation extraction with a more flexible system.
 
 import re
 import json
+from collections import OrderedDict
+from itertools import islice
 from typing import Dict, List, Any, Optional, Tuple
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
+import orjson
 import structlog
 
 logger = structlog.get_logger()
 
+# Extraction patterns, compiled once at import instead of per tool result
+_URL_PATTERNS = tuple(re.compile(pattern, re.IGNORECASE) for pattern in (
+    # Standard URLs
+    r'https?://[^\s\)>\]"\']+',
+    # Markdown links
+    r'\[.*?\]\((https?://[^\)]+)\)',
+    # HTML links
+    r'href=["\']?(https?://[^"\'>\s]+)',
+    # JSON fields - prioritize meaningful URLs
+    r'"(?:url|html_url|web_url|browse_url|permalink|link|href)":\s*"(https?://[^"]+)"',
+))
+
+# Avatar/icon and other non-content URLs (matched against the lowercased URL)
+_URL_SKIP_SUBSTRINGS = (
+    'avatar', 'icon', 'useravatar', 'viewavatar', 'avatartype=',
+    'avatarId=', 'secure/useravatar', 'secure/viewavatar',
+    'images/icons/', '/images/status', '/secure/thumbnail'
+)
+
+_TICKET_RE = re.compile(r'\b([A-Z][A-Z0-9]*-\d+)\b')
+_PR_NUMBER_RE = re.compile(r'(?:PR|pull request|#)[\s#]*(\d+)', re.IGNORECASE)
+_ISSUE_NUMBER_RE = re.compile(r'(?:issue|#)[\s#]*(\d+)', re.IGNORECASE)
+_FILE_PATH_RE = re.compile(r'(?:^|[\s"])([/\\]?(?:[a-zA-Z0-9_\-]+[/\\])*[a-zA-Z0-9_\-]+\.[a-zA-Z0-9]+)')
+_DOCUMENT_ID_RE = re.compile(r'(?:document/d/|file/d/|id=)([a-zA-Z0-9_\-]{20,})')
+
+_TITLE_PATTERNS = tuple(re.compile(pattern, re.MULTILINE | re.IGNORECASE) for pattern in (
+    # Jira-style: "TICKET-123: Title"
+    r'([A-Z]+-\d+):\s*([^\n\r]{5,100})',
+    # Markdown headers
+    r'^#{1,3}\s+([^\n\r]+)$',
+    # JSON title fields
+    r'"(?:title|name|summary|subject)":\s*"([^"]+)"',
+    # HTML title
+    r'<title>([^<]+)</title>',
+    # Document name patterns
+    r'(?:Document|File|Page):\s*([^\n\r]+)',
+))
+
+# Metadata of recently processed results, keyed by tool name, the full result text and
+# the canonical params: retries and repeated identical calls (often served from the tool
+# result cache) skip re-extraction. The text itself is part of the key so a hit can never
+# hand back another call's metadata.
+PROCESSED_RESULT_CACHE_MAXSIZE = 512
+_processed_result_cache: "OrderedDict[Tuple[str, str, bytes], ToolResultMetadata]" = OrderedDict()
+
 
 @dataclass
 class ToolResultMetadata:
@@ -64,6 +112,23 @@ class ToolResultProcessor:
             logger.debug(f"Skipping failed tool result: {tool_name}")
             return metadata
         
+        cache_key = (
+            tool_name,
+            result_str,
+            orjson.dumps(tool_params or {}, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS, default=str)
+        )
+        cached = _processed_result_cache.get(cache_key)
+        if cached is not None:
+            _processed_result_cache.move_to_end(cache_key)
+            # Fresh containers: callers may extend the returned metadata
+            return replace(
+                cached,
+                urls=list(cached.urls),
+                titles=list(cached.titles),
+                identifiers=dict(cached.identifiers),
+                raw_data=tool_result
+            )
+        
         # Store raw data for later processing
         metadata.raw_data = tool_result
         
@@ -94,6 +159,16 @@ class ToolResultProcessor:
             identifiers=list(metadata.identifiers.keys())
         )
         
+        _processed_result_cache[cache_key] = replace(
+            metadata,
+            urls=list(metadata.urls),
+            titles=list(metadata.titles),
+            identifiers=dict(metadata.identifiers),
+            raw_data=None
+        )
+        if len(_processed_result_cache) > PROCESSED_RESULT_CACHE_MAXSIZE:
+            _processed_result_cache.popitem(last=False)
+        
         return metadata
     
     @staticmethod
@@ -101,22 +176,9 @@ class ToolResultProcessor:
         """Extract all URLs from content"""
         urls = []
         
-        # Comprehensive URL patterns
-        url_patterns = [
-            # Standard URLs
-            r'https?://[^\s\)>\]"\']+',
-            # Markdown links
-            r'\[.*?\]\((https?://[^\)]+)\)',
-            # HTML links
-            r'href=["\']?(https?://[^"\'>\s]+)',
-            # JSON fields - prioritize meaningful URLs
-            r'"(?:url|html_url|web_url|browse_url|permalink|link|href)":\s*"(https?://[^"]+)"',
-        ]
-        
         seen_urls = set()
-        for pattern in url_patterns:
-            matches = re.findall(pattern, content, re.IGNORECASE)
-            for match in matches:
+        for pattern in _URL_PATTERNS:
+            for match in pattern.findall(content):
                 url = match if isinstance(match, str) else match[0]
                 # Clean up URL
                 url = url.strip().rstrip('.,;:')
@@ -129,17 +191,9 @@ class ToolResultProcessor:
                 if url.endswith(('.png', '.jpg', '.gif', '.svg', '.ico', '.jpeg', '.webp')):
                     continue
                 
-                # Skip avatar and icon URLs
-                if any(skip_pattern in url.lower() for skip_pattern in [
-                    'avatar', 'icon', 'useravatar', 'viewavatar', 'avatartype=', 
-                    'avatarId=', 'secure/useravatar', 'secure/viewavatar'
-                ]):
-                    continue
-                
-                # Skip other non-content URLs
-                if any(skip_pattern in url.lower() for skip_pattern in [
-                    'images/icons/', '/images/status', '/secure/thumbnail'
-                ]):
+                # Skip avatar, icon and other non-content URLs
+                url_lower = url.lower()
+                if any(skip_pattern in url_lower for skip_pattern in _URL_SKIP_SUBSTRINGS):
                     continue
                 
                 # Convert Jira API URLs to browse URLs
@@ -159,37 +213,33 @@ class ToolResultProcessor:
         identifiers = {}
         
         # Jira/Issue tickets
-        ticket_pattern = r'\b([A-Z][A-Z0-9]*-\d+)\b'
-        tickets = re.findall(ticket_pattern, content)
+        # Only the first 10 tickets are used, so stop scanning once they are found
+        tickets = [match.group(1) for match in islice(_TICKET_RE.finditer(content), 10)]
         if tickets:
             # Store all tickets, but also the first one as primary
-            identifiers['tickets'] = ','.join(set(tickets[:10]))  # Limit to 10
+            identifiers['tickets'] = ','.join(set(tickets))  # Limit to 10
             identifiers['primary_ticket'] = tickets[0]
         
         # GitHub PR/Issue numbers
         if 'github' in tool_name.lower() or 'github.com' in content:
-            pr_pattern = r'(?:PR|pull request|#)[\s#]*(\d+)'
-            issue_pattern = r'(?:issue|#)[\s#]*(\d+)'
-            
-            pr_matches = re.findall(pr_pattern, content, re.IGNORECASE)
-            if pr_matches:
-                identifiers['pr_number'] = pr_matches[0]
+            # Only the first match of each is used: search instead of scanning everything
+            pr_match = _PR_NUMBER_RE.search(content)
+            if pr_match:
+                identifiers['pr_number'] = pr_match.group(1)
             
-            issue_matches = re.findall(issue_pattern, content, re.IGNORECASE)
-            if issue_matches:
-                identifiers['issue_number'] = issue_matches[0]
+            issue_match = _ISSUE_NUMBER_RE.search(content)
+            if issue_match:
+                identifiers['issue_number'] = issue_match.group(1)
         
         # File paths
-        file_pattern = r'(?:^|[\s"])([/\\]?(?:[a-zA-Z0-9_\-]+[/\\])*[a-zA-Z0-9_\-]+\.[a-zA-Z0-9]+)'
-        file_matches = re.findall(file_pattern, content)
-        if file_matches:
-            identifiers['file_path'] = file_matches[0]
+        file_match = _FILE_PATH_RE.search(content)
+        if file_match:
+            identifiers['file_path'] = file_match.group(1)
         
         # Document IDs (Google Drive, etc.)
-        doc_id_pattern = r'(?:document/d/|file/d/|id=)([a-zA-Z0-9_\-]{20,})'
-        doc_matches = re.findall(doc_id_pattern, content)
-        if doc_matches:
-            identifiers['document_id'] = doc_matches[0]
+        doc_match = _DOCUMENT_ID_RE.search(content)
+        if doc_match:
+            identifiers['document_id'] = doc_match.group(1)
         
         return identifiers
     
@@ -198,24 +248,11 @@ class ToolResultProcessor:
         """Extract potential titles from content"""
         titles = []
         
-        # Common title patterns
-        title_patterns = [
-            # Jira-style: "TICKET-123: Title"
-            r'([A-Z]+-\d+):\s*([^\n\r]{5,100})',
-            # Markdown headers
-            r'^#{1,3}\s+([^\n\r]+)$',
-            # JSON title fields
-            r'"(?:title|name|summary|subject)":\s*"([^"]+)"',
-            # HTML title
-            r'<title>([^<]+)</title>',
-            # Document name patterns
-            r'(?:Document|File|Page):\s*([^\n\r]+)',
-        ]
-        
         seen_titles = set()
-        for pattern in title_patterns:
-            matches = re.findall(pattern, content, re.MULTILINE | re.IGNORECASE)
-            for match in matches:
+        for pattern in _TITLE_PATTERNS:
+            # Matched lazily: the title limit below ends the scan early on large results
+            for match_obj in pattern.finditer(content):
+                match = match_obj.groups() if pattern.groups > 1 else match_obj.group(1)  # Same shape as re.findall
                 if isinstance(match, tuple):
                     # For Jira-style, combine ticket and title
                     if len(match) == 2 and match[0] and match[1]:
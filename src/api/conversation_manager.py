@@ -170,20 +170,17 @@ class ConversationManager:
     ) -> list:
         """Load conversation history for context"""
         try:
+            # Only role and content are used: no full rows (or their JSONB payloads)
             result = await self.db.execute(
-                select(Message)
+                select(Message.role, Message.content)
                 .where(Message.conversation_id == conversation_id)
                 .order_by(Message.created_at.desc())
                 .limit(limit)
             )
-            messages = list(reversed(result.scalars().all()))
+            messages = list(reversed(result.all()))
             
             context_parts = []
-            for msg in messages:
-                # Extract data early to avoid greenlet issues
-                role = msg.role
-                content = msg.content
-                
+            for role, content in messages:
                 role_name = "Human" if role == "user" else "Assistant"
                 context_parts.append(f"{role_name}: {content}")
             
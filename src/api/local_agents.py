@@ -26,7 +26,8 @@ from src.api.models import (
 )
 from src.auth.google_oauth import get_current_user, get_current_user_with_agent_token
 from src.db.base import get_db_session
-from src.db.models import User, Source, SourceTool
+from src.db.models import User, Source
+from src.agents.fast_mcp import FastMCPService
 
 logger = structlog.get_logger()
 router = APIRouter(prefix="/agents", tags=["local-agents"])
@@ -538,29 +539,17 @@ async def refresh_agent_tools(
         
         tools = tools_data.get("tools", [])
         
-        # Clear existing cached tools for this source
-        from sqlalchemy import delete
-        await db.execute(
-            delete(SourceTool).where(SourceTool.source_id == source_id)
+        # Cache the discovered tools (single upsert + delete of tools no longer exposed)
+        tools_count = await FastMCPService.replace_cached_tools(
+            db,
+            source_id,
+            (
+                (tool["name"], tool.get("description", ""), tool.get("inputSchema", {}))
+                for tool in tools
+                if isinstance(tool, dict) and tool.get("name")
+            )
         )
         
-        # Cache the discovered tools
-        from datetime import datetime, timezone
-        tools_count = 0
-        
-        for tool in tools:
-            if isinstance(tool, dict) and tool.get("name"):
-                source_tool = SourceTool(
-                    source_id=source_id,
-                    tool_name=tool["name"],
-                    tool_description=tool.get("description", ""),
-                    tool_schema=tool.get("inputSchema", {}),
-                    last_refreshed_at=datetime.now(timezone.utc),
-                    is_active=True
-                )
-                db.add(source_tool)
-                tools_count += 1
-        
         # Update source status
         source.tools_cache_status = "cached"
         source.tools_last_cached_at = datetime.now(timezone.utc)
@@ -4,7 +4,6 @@ Query API endpoint with streaming support
 Handles the main /query endpoint for federated search and chat.
 """
 
-import json
 import uuid
 from typing import Optional, AsyncGenerator
 from datetime import datetime, timezone
@@ -12,6 +11,7 @@ from datetime import datetime, timezone
 from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
 from fastapi.responses import StreamingResponse, JSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
+import orjson
 import structlog
 
 from src.api.models import QueryRequest, QueryResponse, QuerySyncResponse, SimpleQueryResponse, SimpleSource
@@ -27,8 +27,8 @@ router = APIRouter()
 
 
 async def format_sse_chunk(chunk: dict) -> str:
-    """Format a chunk as Server-Sent Events data"""
-    return f"data: {json.dumps(chunk)}\n\n"
+    """Format a chunk as Server-Sent Events data (compact orjson; non-str keys stringified like json.dumps)"""
+    return f"data: {orjson.dumps(chunk, option=orjson.OPT_NON_STR_KEYS).decode()}\n\n"
 
 
 def transform_final_response_to_simple(chunk: dict) -> dict:
@@ -853,30 +853,17 @@ async def _refresh_local_source_tools(
             
             tools = tools_data.get("tools", [])
             
-            # Cache the discovered tools
-            from src.db.models import SourceTool
-            from sqlalchemy import delete
-            
-            # Clear existing cached tools for this source
-            await db.execute(
-                delete(SourceTool).where(SourceTool.source_id == source_id)
+            # Cache the discovered tools (single upsert + delete of tools no longer exposed)
+            tools_count = await FastMCPService.replace_cached_tools(
+                db,
+                source_id,
+                (
+                    (tool["name"], tool.get("description", ""), tool.get("inputSchema", {}))
+                    for tool in tools
+                    if isinstance(tool, dict) and tool.get("name")
+                )
             )
             
-            # Cache the discovered tools
-            tools_count = 0
-            for tool in tools:
-                if isinstance(tool, dict) and tool.get("name"):
-                    source_tool = SourceTool(
-                        source_id=source_id,
-                        tool_name=tool["name"],
-                        tool_description=tool.get("description", ""),
-                        tool_schema=tool.get("inputSchema", {}),
-                        last_refreshed_at=datetime.now(timezone.utc),
-                        is_active=True
-                    )
-                    db.add(source_tool)
-                    tools_count += 1
-            
             # Update source status
             from sqlalchemy import update
             await db.execute(
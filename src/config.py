@@ -21,6 +21,10 @@ class Settings(BaseSettings):
     fast_tool_calling_model: str = Field(default="claude-3-5-sonnet-20240620", env="FAST_TOOL_CALLING_MODEL")
     enable_fast_tool_calling: bool = Field(default=True, env="ENABLE_FAST_TOOL_CALLING")
     
+    # MCP
+    mcp_discover_concurrency: int = Field(default=8, env="MCP_DISCOVER_CONCURRENCY")
+    mcp_call_timeout: float = Field(default=60.0, env="MCP_CALL_TIMEOUT")  # Seconds per tool call attempt
+    
     # AWS
     aws_region: str = Field(default="us-east-1", env="AWS_REGION")
     aws_kms_key_id: str = Field(default="", env="AWS_KMS_KEY_ID")
@@ -6,6 +6,7 @@ from sqlalchemy.orm import Session
 from contextlib import contextmanager, asynccontextmanager
 import structlog
 import ssl
+import orjson
 
 from src.config import settings
 
@@ -19,12 +20,20 @@ def create_ssl_context():
     ssl_context.verify_mode = ssl.CERT_NONE
     return ssl_context
 
+
+def _json_serializer(value) -> str:
+    """Serialize JSON/JSONB column values with orjson (returns str as the dialects expect)."""
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
 # Create SQLAlchemy engine
 engine = create_engine(
     settings.database_url,
     pool_pre_ping=True,  # Verify connections before use
     pool_recycle=300,    # Recycle connections every 5 minutes
-    echo=settings.debug  # Log SQL queries in debug mode
+    echo=settings.debug,  # Log SQL queries in debug mode
+    json_serializer=_json_serializer,
+    json_deserializer=orjson.loads
 )
 
 # Create sessionmaker
@@ -43,7 +52,9 @@ async_engine = create_async_engine(
     pool_pre_ping=True,
     pool_recycle=300,
     echo=settings.debug,
-    connect_args=connect_args
+    connect_args=connect_args,
+    json_serializer=_json_serializer,
+    json_deserializer=orjson.loads
 )
 
 # Create async sessionmaker
@@ -7,11 +7,13 @@ Unified approach for both Hive-style URLs and header-based authentication.
 
 import uuid
 from typing import Dict, List, Optional, Any
+from urllib.parse import urlparse, parse_qs
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, update
 import structlog
 
 from .models import Source
+from .queries import uuid_in
 
 logger = structlog.get_logger()
 
@@ -116,6 +118,46 @@ class SimplifiedCredentialManager:
             )
             return None
     
+    @staticmethod
+    async def get_sources_auth(
+        db: AsyncSession,
+        source_ids: List[uuid.UUID]
+    ) -> Dict[uuid.UUID, Dict[str, Any]]:
+        """
+        Get authentication configuration for several sources in one query
+        
+        Args:
+            db: Database session
+            source_ids: Source IDs to get auth for
+            
+        Returns:
+            Dict mapping source_id to {server_url, auth_headers}; missing sources are omitted
+        """
+        if not source_ids:
+            return {}
+        
+        try:
+            result = await db.execute(
+                select(Source.source_id, Source.server_url, Source.auth_headers)
+                .where(uuid_in(Source.source_id, source_ids))
+            )
+            
+            return {
+                source_id: {
+                    "server_url": server_url,
+                    "auth_headers": auth_headers or {}
+                }
+                for source_id, server_url, auth_headers in result.all()
+            }
+            
+        except Exception as e:
+            logger.error(
+                "Failed to get sources authentication",
+                source_ids=source_ids,
+                error=str(e)
+            )
+            return {}
+    
     @staticmethod
     async def get_sources_auth_config(
         db: AsyncSession,
@@ -138,7 +180,7 @@ class SimplifiedCredentialManager:
             result = await db.execute(
                 select(Source.source_id, Source.name, Source.server_url, Source.auth_headers)
                 .where(
-                    Source.source_id.in_(source_ids),
+                    uuid_in(Source.source_id, source_ids),
                     Source.is_active.is_(True)
                 )
             )
@@ -211,7 +253,6 @@ class MCPCredentialManager:
             server_url = auth_config.get("server_url", "")
             if "x-api-key=" in server_url:
                 # Extract from URL parameter
-                from urllib.parse import urlparse, parse_qs
                 parsed = urlparse(server_url)
                 query_params = parse_qs(parsed.query)
                 if "x-api-key" in query_params:
@@ -308,7 +349,7 @@ class MCPCredentialManager:
             result = await db.execute(
                 select(Source.source_id, Source.name, Source.server_url, Source.auth_headers)
                 .where(
-                    Source.source_id.in_(source_ids),
+                    uuid_in(Source.source_id, source_ids),
                     Source.is_active.is_(True)
                 )
             )
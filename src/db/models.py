@@ -6,7 +6,7 @@ import uuid
 from datetime import datetime
 from typing import List, Optional
 from enum import Enum
-from sqlalchemy import Column, String, Text, DateTime, Boolean, ForeignKey, ARRAY
+from sqlalchemy import Column, String, Text, DateTime, Boolean, ForeignKey, ARRAY, UniqueConstraint, Index, text
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -41,6 +41,14 @@ class User(Base):
 class Source(Base):
     """Source model - represents individual MCP server connections"""
     __tablename__ = "sources"
+    __table_args__ = (
+        # Tool loading filters a user's sources on exactly this predicate
+        Index(
+            "ix_sources_owner_user_id_active_cached",
+            "owner_user_id",
+            postgresql_where=text("is_active AND tools_cache_status = 'cached'")
+        ),
+    )
     
     source_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     name = Column(String(255), nullable=False)
@@ -166,6 +174,10 @@ class Conversation(Base):
 class Message(Base):
     """Message model for individual chat messages"""
     __tablename__ = "messages"
+    __table_args__ = (
+        # History loading reads a conversation's latest messages in creation order
+        Index("ix_messages_conversation_id_created_at", "conversation_id", "created_at"),
+    )
     
     message_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     conversation_id = Column(UUID(as_uuid=True), ForeignKey("conversations.conversation_id"), nullable=False)
@@ -195,6 +207,9 @@ class Message(Base):
 class SourceTool(Base):
     """Cached tool metadata from MCP servers - populated during source creation/refresh"""
     __tablename__ = "source_tools"
+    __table_args__ = (
+        UniqueConstraint("source_id", "tool_name", name="uq_source_tools_source_id_tool_name"),
+    )
     
     tool_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     source_id = Column(UUID(as_uuid=True), ForeignKey("sources.source_id"), nullable=False)
@@ -0,0 +1,25 @@
+"""
+Shared query-building helpers
+
+Keeps statements of the same shape bound the same way across the codebase.
+"""
+
+import uuid
+from typing import Any, Iterable
+
+from sqlalchemy import any_, literal
+from sqlalchemy.dialects.postgresql import ARRAY, UUID as PG_UUID
+
+# Type for binding a list of IDs as one uuid[] parameter
+UUID_ARRAY = ARRAY(PG_UUID(as_uuid=True))
+
+
+def uuid_in(column: Any, ids: Iterable[uuid.UUID]) -> Any:
+    """
+    column = ANY(:ids) with the IDs bound as one uuid[] parameter
+    
+    Unlike IN (...), which binds every element separately, the SQL text does not
+    depend on the list length, so one prepared statement serves any number of IDs.
+    Duplicate IDs (e.g. a source attached to several bots) are bound only once.
+    """
+    return column == any_(literal(list(dict.fromkeys(ids)), UUID_ARRAY))
@@ -15,7 +15,10 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, delete
 import structlog
 
+from src.config import settings
+from src.db.base import AsyncSessionLocal
 from src.db.models import Source, SourceTool
+from src.db.queries import uuid_in
 from src.agents.fast_mcp import FastMCPService
 
 logger = structlog.get_logger()
@@ -214,7 +217,7 @@ class ToolCacheService:
         tools_query = select(SourceTool, Source.name.label('source_name')).join(
             Source, SourceTool.source_id == Source.source_id
         ).where(
-            SourceTool.source_id.in_(source_ids),
+            uuid_in(SourceTool.source_id, source_ids),
             SourceTool.is_active.is_(True),
             Source.is_active.is_(True)
         )
@@ -257,7 +260,7 @@ class ToolCacheService:
         if not source_ids:
             return {}
         
-        sources_query = select(Source).where(Source.source_id.in_(source_ids))
+        sources_query = select(Source).where(uuid_in(Source.source_id, source_ids))
         result = await db.execute(sources_query)
         sources = result.scalars().all()
         
@@ -277,6 +280,10 @@ class ToolCacheService:
         """
         Refresh tools for all active sources (background task)
         
+        Sources are refreshed concurrently (bounded by MCP_DISCOVER_CONCURRENCY),
+        each in its own database session since an AsyncSession cannot be shared
+        between concurrent tasks.
+        
         Args:
             db: Database session
             
@@ -297,11 +304,24 @@ class ToolCacheService:
             "errors": []
         }
         
-        for source in sources:
+        semaphore = asyncio.Semaphore(settings.mcp_discover_concurrency)
+        
+        async def _refresh_one(source_id: uuid.UUID) -> Dict[str, Any]:
+            async with semaphore:
+                async with AsyncSessionLocal() as source_db:
+                    return await ToolCacheService.cache_tools_for_source(
+                        source_db, source_id, force_refresh=True
+                    )
+        
+        outcomes = await asyncio.gather(
+            *(_refresh_one(source.source_id) for source in sources),
+            return_exceptions=True
+        )
+        
+        for source, result in zip(sources, outcomes):
             try:
-                result = await ToolCacheService.cache_tools_for_source(
-                    db, source.source_id, force_refresh=True
-                )
+                if isinstance(result, BaseException):
+                    raise result
                 
                 if result["success"]:
                     refresh_results["successful"] += 1
@@ -14,6 +14,7 @@ import structlog
 
 from src.config import settings, TEST_MODE
 from src.api import query, conversations, bots, sources, mcp_management, auth, local_agents, agent_tokens
+from src.agents.fast_mcp import mcp_session_pool
 # Removed global_mcp import - using FastMCPAgent approach
 
 # Configure structured logging
@@ -52,6 +53,7 @@ async def lifespan(app: FastAPI):
         
         # Shutdown
         logger.info("Shutting down Scintilla application")
+        await mcp_session_pool.close_all()
     except Exception as e:
         logger.error("Error during application lifespan", error=str(e), error_type=type(e).__name__)
         import traceback